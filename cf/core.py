@@ -9,9 +9,11 @@ This module implements the main CF protocol that orchestrates the four phases:
 """
 
 import os
-import hashlib
+import json
 import time
-from typing import Any, Dict, List, Tuple, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
 from .extractors import InformationBottleneckExtractor
@@ -21,6 +23,11 @@ from .proofs import DeletionProofGenerator
 from .utils import SecurityParameters, PerformanceMetrics
 
 
+# Source types the obliterator never overwrites in place, so crystallization
+# and obliteration can read them concurrently
+IMMUTABLE_SOURCE_TYPES = (str, bytes, tuple, int, float, frozenset)
+
+
 @dataclass
 class ForgettingResult:
     """Result of the CF protocol execution"""
@@ -109,15 +116,32 @@ class CryptographicForgetting:
         
         start_time = time.time()
         
-        # Phase 1: Intent Crystallization
-        self.performance_metrics.phase_start("crystallization")
-        resonance = self.extractor.extract(source_data, functional_requirements)
-        self.performance_metrics.phase_end("crystallization")
-        
-        # Phase 2: Cryptographic Obliteration
-        self.performance_metrics.phase_start("obliteration")
-        deletion_certificates = self.obliterator.obliterate(source_data)
-        self.performance_metrics.phase_end("obliteration")
+        # Phases 1 and 2 produce independent outputs from the source
+        if isinstance(source_data, IMMUTABLE_SOURCE_TYPES):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                # Phase 1: Intent Crystallization
+                resonance_future = executor.submit(
+                    self._timed_phase, "crystallization",
+                    self.extractor.extract, source_data, functional_requirements
+                )
+                
+                # Phase 2: Cryptographic Obliteration
+                certificates_future = executor.submit(
+                    self._timed_phase, "obliteration",
+                    self.obliterator.obliterate, source_data
+                )
+                
+                resonance = resonance_future.result()
+                deletion_certificates = certificates_future.result()
+        else:
+            # Mutable sources are overwritten during obliteration, so
+            # crystallization must finish reading them first
+            resonance = self._timed_phase(
+                "crystallization", self.extractor.extract, source_data, functional_requirements
+            )
+            deletion_certificates = self._timed_phase(
+                "obliteration", self.obliterator.obliterate, source_data
+            )
         
         # Phase 3: Resonance Synthesis
         self.performance_metrics.phase_start("synthesis")
@@ -152,6 +176,41 @@ class CryptographicForgetting:
         
         return result
     
+    def forget_batch(self, jobs: List[Tuple[Any, Dict[str, Any]]]) -> List[ForgettingResult]:
+        """
+        Execute the CF protocol for a batch of sources.
+        
+        Jobs with identical functional requirements are run back to back so
+        the extractor's warm-start cache is reused across them. Components keep
+        per-instance state (MINE network, RNG scratch), so jobs run one at a
+        time; each job still overlaps its own crystallization and obliteration.
+        
+        Args:
+            jobs: List of (source_data, functional_requirements) pairs
+            
+        Returns:
+            ForgettingResult for each job, in input order
+        """
+        # Group jobs by canonical requirements to maximize warm-start hits
+        order = sorted(
+            range(len(jobs)),
+            key=lambda i: json.dumps(jobs[i][1], sort_keys=True, default=str)
+        )
+        
+        results: List[Optional[ForgettingResult]] = [None] * len(jobs)
+        for index in order:
+            source_data, functional_requirements = jobs[index]
+            results[index] = self.forget(source_data, functional_requirements)
+        
+        return results
+    
+    def _timed_phase(self, phase_name: str, func: Callable, *args) -> Any:
+        """Run a protocol phase and record its duration"""
+        start = time.perf_counter()
+        result = func(*args)
+        self.performance_metrics.record_phase(phase_name, time.perf_counter() - start)
+        return result
+    
     def verify_deletion_proof(self, proof: bytes, 
                              public_inputs: Dict[str, Any]) -> bool:
         """
@@ -196,18 +255,27 @@ class CryptographicForgetting:
     
     def _get_data_size(self, data: Any) -> int:
         """Get size of data in bytes"""
-        if isinstance(data, str):
-            return len(data.encode('utf-8'))
-        elif isinstance(data, (list, tuple)):
-            return sum(self._get_data_size(item) for item in data)
-        elif isinstance(data, dict):
-            return sum(self._get_data_size(k) + self._get_data_size(v) for k, v in data.items())
-        elif hasattr(data, 'nbytes'):
-            return data.nbytes
-        elif hasattr(data, '__len__'):
-            return len(data) * 8  # Estimate
-        else:
-            return len(str(data).encode('utf-8'))
+        total = 0
+        stack = deque([data])
+        
+        # Walk nested containers with an explicit stack instead of recursion
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                total += len(item.encode('utf-8'))
+            elif isinstance(item, (list, tuple)):
+                stack.extend(item)
+            elif isinstance(item, dict):
+                stack.extend(item.keys())
+                stack.extend(item.values())
+            elif hasattr(item, 'nbytes'):
+                total += item.nbytes
+            elif hasattr(item, '__len__'):
+                total += len(item) * 8  # Estimate
+            else:
+                total += len(str(item).encode('utf-8'))
+        
+        return total
     
     def get_security_guarantees(self) -> Dict[str, str]:
         """
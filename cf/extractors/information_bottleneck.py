@@ -5,13 +5,40 @@ This module implements Phase 1 of the CF protocol: extracting minimal
 functional representations while minimizing mutual information with source.
 """
 
+import hashlib
+import json
 import numpy as np
-import torch
-import torch.nn as nn
-from typing import Any, Dict, Tuple, Optional
-from scipy.optimize import minimize
+from collections import Counter, OrderedDict, deque
+from typing import Any, Callable, Dict, Tuple, Optional
 
 from .mine_estimator import MINEEstimator
+from . import _numba_kernels as kernels
+
+
+# Bound on retained extraction records for long-running services
+MAX_EXTRACTION_HISTORY = 1024
+
+# Number of converged resonances kept for warm-starting repeated requirements
+WARM_START_CACHE_SIZE = 128
+
+# Working precision of the IB objective; the loss is a heuristic sum of
+# norms and entropies and does not need float64
+RESONANCE_DTYPE = np.float32
+
+# Task types with a dedicated loss; anything else uses the generic loss
+TASK_SPECIFIC_LOSSES = ('text_generation', 'classification', 'translation')
+
+# scipy.optimize is imported on first use to keep package import cheap
+_minimize = None
+
+
+def _get_minimize():
+    """Return scipy.optimize.minimize, importing it on first call"""
+    global _minimize
+    if _minimize is None:
+        from scipy.optimize import minimize
+        _minimize = minimize
+    return _minimize
 
 
 class InformationBottleneckExtractor:
@@ -23,22 +50,49 @@ class InformationBottleneckExtractor:
     where λ controls the mutual information penalty.
     """
     
-    def __init__(self, target_dims: int, mutual_info_penalty: float = 10.0):
+    def __init__(self, target_dims: int, mutual_info_penalty: float = 10.0,
+                 warm_start: bool = True):
         """
         Initialize the Information Bottleneck extractor.
         
         Args:
             target_dims: Target dimensionality of resonance vector
             mutual_info_penalty: Penalty coefficient for mutual information
+            warm_start: Start from the last converged resonance for the same requirements
         """
         self.target_dims = target_dims
         self.mi_penalty = mutual_info_penalty
+        self.warm_start = warm_start
         self.mine_estimator = MINEEstimator(
             learning_rate=0.001,
             batch_size=64,
             epochs=50
         )
-        self.extraction_history = []
+        
+        # Probe MINE once so the objective can dispatch without a try block
+        try:
+            self.mine_estimator.probe()
+            self._use_mine = True
+        except NotImplementedError:
+            self._use_mine = False
+        
+        self.extraction_history = deque(maxlen=MAX_EXTRACTION_HISTORY)
+        
+        # Per-instance RNG and scratch buffer for the initial resonance
+        self._rng = np.random.default_rng()
+        self._resonance_init = np.empty(self.target_dims, dtype=RESONANCE_DTYPE)
+        
+        # Output buffers reused by the resonance feature extractors on every
+        # objective evaluation; callers must copy before mutating them
+        self._semantic_buf = np.zeros(100, dtype=RESONANCE_DTYPE)
+        self._semantic_jacobian = np.eye(100, self.target_dims, dtype=RESONANCE_DTYPE)
+        self._feature_buf = np.zeros(3, dtype=RESONANCE_DTYPE)
+        
+        # (resonance, (mean, std, norm)) for the evaluation in progress
+        self._last_stats = None
+        
+        # LRU of converged resonances keyed by requirements digest
+        self._warm_cache = OrderedDict()
         
     def extract(self, source_data: Any, 
                 functional_requirements: Dict[str, Any]) -> np.ndarray:
@@ -50,21 +104,61 @@ class InformationBottleneckExtractor:
             functional_requirements: Requirements for functional preservation
             
         Returns:
-            Resonance vector that preserves function while minimizing mutual information
+            float64 resonance vector that preserves function while minimizing
+            mutual information
         """
-        # Initialize resonance vector
-        resonance = np.random.normal(0, 1, self.target_dims)
+        # Initialize resonance vector (L-BFGS-B iterates in float64)
+        warm_key = self._warm_start_key(functional_requirements) if self.warm_start else None
+        if warm_key is not None and warm_key in self._warm_cache:
+            self._warm_cache.move_to_end(warm_key)
+            resonance = self._warm_cache[warm_key].copy()
+        else:
+            self._rng.standard_normal(dtype=RESONANCE_DTYPE, out=self._resonance_init)
+            resonance = self._resonance_init.astype(np.float64)
+        
+        # Precompute source-side features once; they do not depend on r
+        source_features = self._extract_source_features(source_data, functional_requirements)
+        
+        # Bind the task loss and regularization once; requirements are fixed here
+        functional_loss_fn = self._resolve_functional_loss(source_features, functional_requirements)
         
-        # Define objective function
-        def objective(r):
-            functional_loss = self._compute_functional_loss(source_data, r, functional_requirements)
-            mutual_info = self._estimate_mutual_information(source_data, r)
+        # A zero penalty makes the MI term (and its estimation cost) vanish
+        mi_penalty = self.mi_penalty
+        use_mi = mi_penalty != 0.0
+        
+        # Loss terms from the most recent objective evaluation
+        last_eval = {'x': None, 'functional_loss': 0.0, 'mutual_info': 0.0}
+        
+        # Define objective returning (loss, gradient) for L-BFGS-B
+        def objective(x):
+            r = x.astype(RESONANCE_DTYPE)
+            
+            # Summary statistics shared by all loss helpers for this iterate
+            self._last_stats = (r, self._resonance_stats(r))
+            functional_loss, functional_grad = functional_loss_fn(r)
+            if use_mi:
+                mutual_info, mutual_info_grad = self._estimate_mutual_information(
+                    source_data, r, source_features
+                )
+                total_loss = functional_loss + mi_penalty * mutual_info
+                total_grad = functional_grad + mi_penalty * mutual_info_grad
+            else:
+                mutual_info = 0.0
+                total_loss, total_grad = functional_loss, functional_grad
+            
+            self._last_stats = None
             
-            total_loss = functional_loss + self.mi_penalty * mutual_info
-            return total_loss
+            last_eval['x'] = x.copy()
+            last_eval['functional_loss'] = float(functional_loss)
+            last_eval['mutual_info'] = mutual_info
+            return float(total_loss), total_grad.astype(np.float64)
+        
+        # Optimize using L-BFGS-B with analytic gradients
+        result = _get_minimize()(objective, resonance, method='L-BFGS-B', jac=True)
         
-        # Optimize using L-BFGS-B
-        result = minimize(objective, resonance, method='L-BFGS-B')
+        # Reuse the final evaluation unless the optimizer returned an earlier point
+        if last_eval['x'] is None or not np.array_equal(last_eval['x'], result.x):
+            objective(result.x)
         
         # Record extraction details
         extraction_record = {
@@ -74,188 +168,278 @@ class InformationBottleneckExtractor:
             'final_loss': result.fun,
             'convergence': result.success,
             'iterations': result.nit,
-            'functional_loss': self._compute_functional_loss(source_data, result.x, functional_requirements),
-            'final_mutual_info': self._estimate_mutual_information(source_data, result.x)
+            'functional_loss': last_eval['functional_loss'],
+            'final_mutual_info': last_eval['mutual_info']
         }
         self.extraction_history.append(extraction_record)
         
+        # Remember the converged resonance for the next call with these requirements
+        if warm_key is not None and result.success:
+            self._warm_cache[warm_key] = result.x.copy()
+            self._warm_cache.move_to_end(warm_key)
+            if len(self._warm_cache) > WARM_START_CACHE_SIZE:
+                self._warm_cache.popitem(last=False)
+        
+        # float32 is only the working precision of the objective; callers
+        # keep getting the optimizer's float64 result
         return result.x
     
-    def _compute_functional_loss(self, source: Any, resonance: np.ndarray, 
-                                requirements: Dict[str, Any]) -> float:
+    def _warm_start_key(self, requirements: Dict[str, Any]) -> bytes:
+        """Stable digest of the functional requirements and target dimensionality"""
+        canonical = json.dumps(requirements, sort_keys=True, default=str)
+        return hashlib.blake2b(f"{self.target_dims}:{canonical}".encode(), digest_size=16).digest()
+    
+    def _extract_source_features(self, source: Any, 
+                                 requirements: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Compute task-specific functional preservation loss.
+        Precompute all source-derived quantities used by the objective.
         
         Args:
             source: Source data
+            requirements: Functional requirements
+            
+        Returns:
+            Dictionary of source features that are constant during optimization
+        """
+        # Single byte histogram shared by the structure and entropy features
+        byte_counts = self._byte_histogram(source) if isinstance(source, str) else None
+        
+        features = {'is_text': isinstance(source, str)}
+        
+        # Structure and complexity feed only the generic loss, and entropy only
+        # the simplified MI estimate; they hash and reduce the source, so skip
+        # them for sources (e.g. lists of dicts) the other paths accept
+        if requirements.get('task_type') not in TASK_SPECIFIC_LOSSES:
+            features['structure'] = self._extract_structure_features(source, byte_counts)
+            features['complexity'] = self._estimate_complexity(source)
+        if self.mi_penalty != 0.0 and not self._use_mine:
+            features['entropy'] = self._calculate_source_entropy(source, byte_counts)
+        
+        if isinstance(source, str):
+            features['length'] = len(source)
+            features['word_count'] = len(source.split())
+            features['char_diversity'] = len(set(source)) / len(source) if source else 0
+        
+        if 'target_class' in requirements:
+            features['class_features'] = self._extract_class_features(
+                source, requirements['target_class']
+            )
+        
+        if 'source_language' in requirements:
+            features['semantic_features'] = self._extract_semantic_features(
+                source, requirements['source_language']
+            )
+        
+        return features
+    
+    def _compute_functional_loss(self, source_features: Dict[str, Any], resonance: np.ndarray, 
+                                requirements: Dict[str, Any]) -> Tuple[float, np.ndarray]:
+        """
+        Compute task-specific functional preservation loss and its gradient.
+        
+        Args:
+            source_features: Precomputed source features
             resonance: Resonance vector
             requirements: Functional requirements
             
         Returns:
-            Functional loss value
+            Tuple of (functional loss value, gradient w.r.t. resonance)
+        """
+        return self._resolve_functional_loss(source_features, requirements)(resonance)
+    
+    def _resolve_functional_loss(self, source_features: Dict[str, Any], 
+                                 requirements: Dict[str, Any]
+                                 ) -> Callable[[np.ndarray], Tuple[float, np.ndarray]]:
         """
-        loss = 0.0
+        Bind the functional loss for fixed source features and requirements.
         
+        Args:
+            source_features: Precomputed source features
+            requirements: Functional requirements
+            
+        Returns:
+            Function mapping resonance to (functional loss value, gradient)
+        """
         # Task-specific functional preservation
-        if 'task_type' in requirements:
-            if requirements['task_type'] == 'text_generation':
-                loss += self._text_functional_loss(source, resonance, requirements)
-            elif requirements['task_type'] == 'classification':
-                loss += self._classification_functional_loss(source, resonance, requirements)
-            elif requirements['task_type'] == 'translation':
-                loss += self._translation_functional_loss(source, resonance, requirements)
-            else:
-                # Generic functional loss
-                loss += self._generic_functional_loss(source, resonance, requirements)
-        else:
-            # Default to generic loss
-            loss += self._generic_functional_loss(source, resonance, requirements)
+        task_losses = {
+            'text_generation': self._text_functional_loss,
+            'classification': self._classification_functional_loss,
+            'translation': self._translation_functional_loss,
+        }
+        # Default to generic loss
+        task_loss = task_losses.get(requirements.get('task_type'), self._generic_functional_loss)
+        
+        # Regularization terms
+        regularization = {
+            'l2': self._l2_regularization,
+            'l1': self._l1_regularization,
+        }.get(requirements.get('regularization'))
         
-        # Add regularization terms
-        if 'regularization' in requirements:
-            if requirements['regularization'] == 'l2':
-                loss += 0.01 * np.linalg.norm(resonance) ** 2
-            elif requirements['regularization'] == 'l1':
-                loss += 0.01 * np.linalg.norm(resonance, ord=1)
+        if regularization is None:
+            return lambda resonance: task_loss(source_features, resonance, requirements)
         
-        return loss
+        def functional_loss(resonance):
+            loss, grad = task_loss(source_features, resonance, requirements)
+            reg_loss, reg_grad = regularization(resonance)
+            return loss + reg_loss, grad + reg_grad
+        
+        return functional_loss
+    
+    def _l2_regularization(self, resonance: np.ndarray) -> Tuple[float, np.ndarray]:
+        """0.01 * ||r||_2^2 and its gradient"""
+        norm = self._resonance_stats(resonance)[2]
+        return 0.01 * norm ** 2, 0.02 * resonance
+    
+    def _l1_regularization(self, resonance: np.ndarray) -> Tuple[float, np.ndarray]:
+        """0.01 * ||r||_1 and its gradient"""
+        return 0.01 * np.linalg.norm(resonance, ord=1), 0.01 * np.sign(resonance)
     
-    def _compute_semantic_structure_loss(self, source: str, resonance: np.ndarray) -> float:
-        """Compute semantic structure loss for text"""
+    def _compute_semantic_structure_loss(self, source_features: Dict[str, Any], 
+                                         resonance: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Compute semantic structure loss for text and its gradient"""
         # Simplified semantic structure loss
-        if len(source) == 0:
-            return 0.0
-        
-        # Basic semantic features
-        word_count = len(source.split())
-        char_diversity = len(set(source)) / len(source)
+        if source_features['length'] == 0:
+            return 0.0, np.zeros_like(resonance)
         
         # Map to resonance space
-        resonance_norm = np.linalg.norm(resonance)
-        
-        # Calculate loss based on structure preservation
-        structure_loss = abs(word_count - resonance_norm * 10) / max(word_count, 1)
-        diversity_loss = abs(char_diversity - np.std(resonance)) / max(char_diversity, 0.1)
+        resonance_norm, norm_grad = self._norm_and_grad(resonance)
+        resonance_std, std_grad = self._std_and_grad(resonance)
         
-        return structure_loss + 0.1 * diversity_loss
+        # Structure and diversity preservation, evaluated as one scalar kernel
+        loss, d_norm, d_std = kernels.semantic_structure_loss(
+            float(source_features['word_count']), float(source_features['char_diversity']),
+            resonance_norm, resonance_std
+        )
+        return loss, d_norm * norm_grad + d_std * std_grad
     
-    def _text_functional_loss(self, source: Any, resonance: np.ndarray, 
-                             requirements: Dict[str, Any]) -> float:
+    def _text_functional_loss(self, source_features: Dict[str, Any], resonance: np.ndarray, 
+                             requirements: Dict[str, Any]) -> Tuple[float, np.ndarray]:
         """Compute functional loss for text generation tasks"""
-        if isinstance(source, str):
+        if source_features['is_text']:
             # Preserve semantic coherence
-            source_length = len(source)
-            resonance_norm = np.linalg.norm(resonance)
-            
-            # Length preservation
-            length_loss = abs(source_length - resonance_norm) / max(source_length, 1)
-            
-            # Semantic structure preservation
-            semantic_loss = self._compute_semantic_structure_loss(source, resonance)
+            resonance_norm, norm_grad = self._norm_and_grad(resonance)
+            resonance_std, std_grad = self._std_and_grad(resonance)
             
-            return length_loss + 0.1 * semantic_loss
-        
-        return 0.0
+            # Length and semantic structure preservation (see _compute_semantic_structure_loss)
+            loss, d_norm, d_std = kernels.text_loss(
+                float(source_features['length']), float(source_features['word_count']),
+                float(source_features['char_diversity']), resonance_norm, resonance_std
+            )
+            return loss, d_norm * norm_grad + d_std * std_grad
+        
+        return 0.0, np.zeros_like(resonance)
     
-    def _classification_functional_loss(self, source: Any, resonance: np.ndarray, 
-                                      requirements: Dict[str, Any]) -> float:
+    def _classification_functional_loss(self, source_features: Dict[str, Any], resonance: np.ndarray, 
+                                      requirements: Dict[str, Any]) -> Tuple[float, np.ndarray]:
         """Compute functional loss for classification tasks"""
-        if 'target_class' in requirements:
-            target_class = requirements['target_class']
-            
+        if 'class_features' in source_features:
             # Preserve class-relevant features
-            class_features = self._extract_class_features(source, target_class)
-            resonance_features = self._extract_resonance_features(resonance)
+            class_features = source_features['class_features']
+            resonance_features, jacobian = self._extract_resonance_features(resonance)
             
             # Feature alignment loss
-            feature_loss = np.linalg.norm(class_features - resonance_features[:len(class_features)])
-            
-            return feature_loss
+            n = len(class_features)
+            return self._alignment_loss(class_features, resonance_features[:n], jacobian[:n])
         
-        return 0.0
+        return 0.0, np.zeros_like(resonance)
     
-    def _translation_functional_loss(self, source: Any, resonance: np.ndarray, 
-                                    requirements: Dict[str, Any]) -> float:
+    def _translation_functional_loss(self, source_features: Dict[str, Any], resonance: np.ndarray, 
+                                    requirements: Dict[str, Any]) -> Tuple[float, np.ndarray]:
         """Compute functional loss for translation tasks"""
-        if 'source_language' in requirements and 'target_language' in requirements:
+        if 'semantic_features' in source_features and 'target_language' in requirements:
             # Preserve cross-lingual semantic mapping
-            source_semantics = self._extract_semantic_features(source, requirements['source_language'])
-            resonance_semantics = self._extract_resonance_semantics(resonance)
+            source_semantics = source_features['semantic_features']
+            resonance_semantics, jacobian = self._extract_resonance_semantics(resonance)
             
             # Semantic mapping preservation
-            mapping_loss = np.linalg.norm(source_semantics - resonance_semantics)
-            
-            return mapping_loss
+            return self._alignment_loss(source_semantics, resonance_semantics, jacobian)
         
-        return 0.0
+        return 0.0, np.zeros_like(resonance)
     
-    def _generic_functional_loss(self, source: Any, resonance: np.ndarray, 
-                                requirements: Dict[str, Any]) -> float:
+    def _generic_functional_loss(self, source_features: Dict[str, Any], resonance: np.ndarray, 
+                                requirements: Dict[str, Any]) -> Tuple[float, np.ndarray]:
         """Compute generic functional loss"""
         # Basic structure preservation
-        source_structure = self._extract_structure_features(source)
-        resonance_structure = self._extract_resonance_structure(resonance)
+        source_structure = source_features['structure']
+        resonance_structure, jacobian = self._extract_resonance_structure(resonance)
         
         # Structure alignment loss
-        structure_loss = np.linalg.norm(source_structure - resonance_structure)
+        structure_loss, structure_grad = self._alignment_loss(
+            source_structure, resonance_structure, jacobian
+        )
         
         # Complexity preservation
-        source_complexity = self._estimate_complexity(source)
-        resonance_complexity = self._estimate_resonance_complexity(resonance)
-        complexity_loss = abs(source_complexity - resonance_complexity)
+        source_complexity = source_features['complexity']
+        resonance_complexity, complexity_grad = self._std_and_grad(resonance)
+        complexity_loss, d_complexity = kernels.gap_loss(
+            float(source_complexity), resonance_complexity, 1.0
+        )
         
-        return structure_loss + 0.1 * complexity_loss
+        return structure_loss + 0.1 * complexity_loss, structure_grad + (0.1 * d_complexity) * complexity_grad
+    
+    def _alignment_loss(self, target: np.ndarray, features: np.ndarray, 
+                        jacobian: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Euclidean distance between target and resonance features, with gradient"""
+        diff = target - features
+        loss = np.linalg.norm(diff)
+        if loss > 0:
+            return loss, -(diff @ jacobian) / loss
+        return loss, np.zeros(jacobian.shape[1], dtype=jacobian.dtype)
     
-    def _estimate_mutual_information(self, source: Any, resonance: np.ndarray) -> float:
+    def _estimate_mutual_information(self, source: Any, resonance: np.ndarray,
+                                     source_features: Optional[Dict[str, Any]] = None
+                                     ) -> Tuple[float, np.ndarray]:
         """
         Estimate mutual information between source and resonance.
         
         Args:
             source: Source data
             resonance: Resonance vector
+            source_features: Precomputed source features (optional)
             
         Returns:
-            Estimated mutual information
+            Tuple of (estimated mutual information, gradient w.r.t. resonance)
         """
-        try:
-            # Use MINE estimator if available
-            return self.mine_estimator.estimate_mi(source, resonance)
-        except:
-            # Fallback to simplified estimation
-            return self._simplified_mi_estimation(source, resonance)
+        # Use MINE estimator if available; it falls back to the simplified
+        # estimate only on numerical (RuntimeError/ValueError) failures
+        if self._use_mine:
+            return self.mine_estimator.estimate_mi_with_gradient(source, resonance)
+        
+        # Fallback to simplified estimation, which is constant in resonance
+        source_entropy = source_features.get('entropy') if source_features is not None else None
+        if source_entropy is None:
+            source_entropy = self._calculate_source_entropy(source)
+        return self._simplified_mi_estimation(source_entropy, resonance), np.zeros_like(resonance)
     
-    def _simplified_mi_estimation(self, source: Any, resonance: np.ndarray) -> float:
+    def _simplified_mi_estimation(self, source_entropy: float, resonance: np.ndarray) -> float:
         """Simplified mutual information estimation"""
-        # Calculate entropies
-        source_entropy = self._calculate_source_entropy(source)
-        resonance_entropy = self._calculate_resonance_entropy(resonance)
-        
-        # Joint entropy approximation
-        joint_entropy = source_entropy + resonance_entropy - np.log2(self.target_dims)
-        
         # Mutual information: I(X;Y) = H(X) + H(Y) - H(X,Y)
-        mutual_info = max(0, source_entropy + resonance_entropy - joint_entropy)
-        
-        return mutual_info
+        return float(kernels.simplified_mutual_information(
+            source_entropy, np.ascontiguousarray(resonance), self.target_dims
+        ))
     
-    def _calculate_source_entropy(self, source: Any) -> float:
+    def _byte_histogram(self, source: str) -> np.ndarray:
+        """Count occurrences of each byte value in the UTF-8 encoding of source"""
+        byte_view = np.frombuffer(source.encode('utf-8'), dtype=np.uint8)
+        return np.bincount(byte_view, minlength=256)
+    
+    def _calculate_source_entropy(self, source: Any, 
+                                  byte_counts: Optional[np.ndarray] = None) -> float:
         """Calculate entropy of source data"""
         if isinstance(source, str):
             if len(source) == 0:
                 return 0.0
-            # Character-level entropy
-            char_counts = {}
-            for char in source:
-                char_counts[char] = char_counts.get(char, 0) + 1
-            
-            probs = [count/len(source) for count in char_counts.values()]
+            # Byte-level entropy over the UTF-8 encoding
+            if byte_counts is None:
+                byte_counts = self._byte_histogram(source)
+            probs = byte_counts[byte_counts > 0] / byte_counts.sum()
             return self._shannon_entropy(probs)
             
         elif isinstance(source, (list, np.ndarray)):
             if len(source) == 0:
                 return 0.0
             # Element-level entropy
-            unique, counts = np.unique(source, return_counts=True)
+            _, counts = np.unique(source, return_counts=True)
             probs = counts / len(source)
             return self._shannon_entropy(probs)
         
@@ -263,61 +447,64 @@ class InformationBottleneckExtractor:
     
     def _calculate_resonance_entropy(self, resonance: np.ndarray) -> float:
         """Calculate entropy of resonance vector"""
-        # Normalize to probability distribution
-        abs_resonance = np.abs(resonance)
-        if np.sum(abs_resonance) > 0:
-            probs = abs_resonance / np.sum(abs_resonance)
-            return self._shannon_entropy(probs)
-        return 0.0
+        # Normalize |r| to a probability distribution
+        return float(kernels.resonance_entropy(np.ascontiguousarray(resonance)))
     
     def _shannon_entropy(self, probs: np.ndarray) -> float:
         """Calculate Shannon entropy from probability distribution"""
-        # Remove zero probabilities
-        probs = probs[probs > 0]
-        if len(probs) == 0:
-            return 0.0
-        
-        # Shannon entropy: H = -Σ p_i * log2(p_i)
-        return -np.sum(probs * np.log2(probs))
+        # Shannon entropy: H = -Σ p_i * log2(p_i), zero probabilities skipped
+        return float(kernels.shannon_entropy(np.ascontiguousarray(probs, dtype=np.float64)))
     
     def _extract_semantic_features(self, source: Any, language: str) -> np.ndarray:
         """Extract semantic features from source"""
         # Simplified semantic feature extraction
         if isinstance(source, str):
             # Basic semantic features based on word frequency
-            words = source.lower().split()
-            word_freq = {}
-            for word in words:
-                word_freq[word] = word_freq.get(word, 0) + 1
+            word_freq = Counter(source.lower().split())
+            top_words = word_freq.most_common(100)
             
-            # Convert to feature vector
-            features = np.zeros(min(100, len(word_freq)))
-            for i, (word, freq) in enumerate(list(word_freq.items())[:100]):
-                features[i] = freq / len(words)
+            # Convert to fixed-size feature vector
+            features = np.zeros(100, dtype=RESONANCE_DTYPE)
+            if top_words:
+                counts = np.fromiter((freq for _, freq in top_words), dtype=RESONANCE_DTYPE, count=len(top_words))
+                features[:len(top_words)] = counts / sum(word_freq.values())
             
             return features
         
-        return np.zeros(100)
+        return np.zeros(100, dtype=RESONANCE_DTYPE)
     
-    def _extract_resonance_semantics(self, resonance: np.ndarray) -> np.ndarray:
-        """Extract semantic features from resonance"""
-        # Map resonance to semantic space
-        semantic_features = resonance[:100]  # Take first 100 dimensions
-        if len(semantic_features) < 100:
-            semantic_features = np.pad(semantic_features, (0, 100 - len(semantic_features)))
+    def _extract_resonance_semantics(self, resonance: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extract semantic features from resonance and their Jacobian.
         
-        return semantic_features
+        Both arrays are shared buffers overwritten on the next call.
+        """
+        # Map resonance to semantic space (first 100 dimensions, zero padded)
+        n = min(100, resonance.size)
+        self._semantic_buf[:n] = resonance[:n]
+        self._semantic_buf[n:] = 0
+        
+        if len(resonance) != self.target_dims:
+            return self._semantic_buf, np.eye(100, len(resonance), dtype=RESONANCE_DTYPE)
+        return self._semantic_buf, self._semantic_jacobian
     
-    def _extract_structure_features(self, source: Any) -> np.ndarray:
+    def _extract_structure_features(self, source: Any, 
+                                    byte_counts: Optional[np.ndarray] = None) -> np.ndarray:
         """Extract structural features from source"""
         if isinstance(source, str):
-            # Structural features: length, character diversity, etc.
+            if not source:
+                return np.zeros(4, dtype=RESONANCE_DTYPE)
+            # Structural features from a single byte histogram:
+            # length, byte diversity, space ratio, ASCII uppercase ratio
+            if byte_counts is None:
+                byte_counts = self._byte_histogram(source)
+            n = byte_counts.sum()
             features = np.array([
                 len(source),
-                len(set(source)) / len(source) if source else 0,
-                source.count(' ') / len(source) if source else 0,
-                sum(c.isupper() for c in source) / len(source) if source else 0
-            ])
+                np.count_nonzero(byte_counts) / n,
+                byte_counts[ord(' ')] / n,
+                byte_counts[ord('A'):ord('Z') + 1].sum() / n
+            ], dtype=RESONANCE_DTYPE)
             return features
         elif isinstance(source, (list, np.ndarray)):
             # Array structural features
@@ -326,20 +513,20 @@ class InformationBottleneckExtractor:
                 len(set(source)) / len(source) if len(source) > 0 else 0,
                 np.std(source) if len(source) > 0 else 0,
                 np.mean(source) if len(source) > 0 else 0
-            ])
+            ], dtype=RESONANCE_DTYPE)
             return features
         
-        return np.zeros(4)
+        return np.zeros(4, dtype=RESONANCE_DTYPE)
     
-    def _extract_resonance_structure(self, resonance: np.ndarray) -> np.ndarray:
-        """Extract structural features from resonance"""
-        features = np.array([
-            len(resonance),
-            np.std(resonance),
-            np.mean(resonance),
-            np.linalg.norm(resonance)
-        ])
-        return features
+    def _extract_resonance_structure(self, resonance: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Extract structural features from resonance and their Jacobian"""
+        std, std_grad = self._std_and_grad(resonance)
+        mean, mean_grad = self._mean_and_grad(resonance)
+        norm, norm_grad = self._norm_and_grad(resonance)
+        
+        features = np.array([len(resonance), std, mean, norm], dtype=resonance.dtype)
+        jacobian = np.vstack([np.zeros_like(resonance), std_grad, mean_grad, norm_grad])
+        return features, jacobian
     
     def _extract_class_features(self, source: Any, target_class: Any) -> np.ndarray:
         """Extract class-relevant features"""
@@ -349,20 +536,58 @@ class InformationBottleneckExtractor:
             features = np.array([
                 len(source),
                 len(set(source)) / len(source) if source else 0,
-                hash(target_class) % 1000 / 1000.0  # Class encoding
-            ])
+                self._stable_class_code(target_class)  # Class encoding
+            ], dtype=RESONANCE_DTYPE)
             return features
         
-        return np.zeros(3)
+        return np.zeros(3, dtype=RESONANCE_DTYPE)
     
-    def _extract_resonance_features(self, resonance: np.ndarray) -> np.ndarray:
-        """Extract features from resonance vector"""
-        features = np.array([
-            np.mean(resonance),
-            np.std(resonance),
-            np.linalg.norm(resonance)
-        ])
-        return features
+    def _stable_class_code(self, target_class: Any) -> float:
+        """Map a class label to [0, 1) independently of PYTHONHASHSEED"""
+        digest = hashlib.blake2s(repr(target_class).encode('utf-8'), digest_size=4).digest()
+        return int.from_bytes(digest, 'little') / 2**32
+    
+    def _extract_resonance_features(self, resonance: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extract features from resonance vector and their Jacobian.
+        
+        The feature array is a shared buffer overwritten on the next call.
+        """
+        mean, mean_grad = self._mean_and_grad(resonance)
+        std, std_grad = self._std_and_grad(resonance)
+        norm, norm_grad = self._norm_and_grad(resonance)
+        
+        self._feature_buf[0] = mean
+        self._feature_buf[1] = std
+        self._feature_buf[2] = norm
+        jacobian = np.vstack([mean_grad, std_grad, norm_grad])
+        return self._feature_buf, jacobian
+    
+    def _resonance_stats(self, resonance: np.ndarray) -> Tuple[float, float, float]:
+        """Mean, standard deviation and norm of resonance, computed in one pass"""
+        if self._last_stats is not None and self._last_stats[0] is resonance:
+            return self._last_stats[1]
+        mean, std, norm = kernels.resonance_stats(np.ascontiguousarray(resonance))
+        return float(mean), float(std), float(norm)
+    
+    def _mean_and_grad(self, resonance: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Mean of resonance and its gradient"""
+        mean = self._resonance_stats(resonance)[0]
+        return mean, np.full(len(resonance), 1.0 / len(resonance), dtype=resonance.dtype)
+    
+    def _std_and_grad(self, resonance: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Standard deviation of resonance and its gradient"""
+        mean, std, _ = self._resonance_stats(resonance)
+        if std > 0:
+            return std, (resonance - mean) / (len(resonance) * std)
+        return std, np.zeros_like(resonance)
+    
+    def _norm_and_grad(self, resonance: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Euclidean norm of resonance and its gradient"""
+        norm = self._resonance_stats(resonance)[2]
+        if norm > 0:
+            return norm, resonance / norm
+        return norm, np.zeros_like(resonance)
     
     def _estimate_complexity(self, data: Any) -> float:
         """Estimate complexity of data"""
@@ -374,7 +599,7 @@ class InformationBottleneckExtractor:
     
     def _estimate_resonance_complexity(self, resonance: np.ndarray) -> float:
         """Estimate complexity of resonance vector"""
-        return np.std(resonance)
+        return self._resonance_stats(resonance)[1]
     
     def _get_data_size(self, data: Any) -> int:
         """Get size of data in bytes"""
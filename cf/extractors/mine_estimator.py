@@ -5,35 +5,75 @@ This module provides a robust implementation of MINE for estimating
 mutual information between source data and resonance vectors.
 """
 
+import math
 import numpy as np
-import torch
-import torch.nn as nn
-import torch.optim as optim
-from typing import Any, Dict, Tuple, Optional
+from collections import Counter
+from typing import Any, Dict, List, Tuple, Optional
 import time
 
+from . import _numba_kernels as kernels
 
-class MINENetwork(nn.Module):
-    """Neural network for MINE estimation"""
+
+# torch is imported on first use to keep package import cheap
+torch = None
+nn = None
+F = None
+optim = None
+_network_class = None
+
+
+def _load_torch():
+    """Import torch on first call and define the torch-backed network class"""
+    global torch, nn, F, optim, _network_class
+    if torch is None:
+        import torch as torch_module
+        import torch.nn as nn_module
+        import torch.nn.functional as functional_module
+        import torch.optim as optim_module
+        torch, nn, F, optim = torch_module, nn_module, functional_module, optim_module
+        _network_class = _define_network_class()
+    return torch
+
+
+def _define_network_class():
+    """Build MINENetwork, which needs torch.nn.Module as its base class"""
     
-    def __init__(self, input_dim: int, hidden_dims: list = [64, 32]):
-        super(MINENetwork, self).__init__()
-        
-        layers = []
-        prev_dim = input_dim
+    class MINENetwork(nn.Module):
+        """Neural network for MINE estimation"""
         
-        for hidden_dim in hidden_dims:
-            layers.append(nn.Linear(prev_dim, hidden_dim))
-            layers.append(nn.ReLU())
-            layers.append(nn.Dropout(0.1))
-            prev_dim = hidden_dim
-        
-        layers.append(nn.Linear(prev_dim, 1))
-        
-        self.network = nn.Sequential(*layers)
-        
-    def forward(self, x):
-        return self.network(x)
+        def __init__(self, input_dim: int, hidden_dims: list = [64, 32]):
+            super(MINENetwork, self).__init__()
+            
+            layers = []
+            prev_dim = input_dim
+            
+            for hidden_dim in hidden_dims:
+                layers.append(nn.Linear(prev_dim, hidden_dim))
+                prev_dim = hidden_dim
+            
+            self.hidden_layers = nn.ModuleList(layers)
+            self.output_layer = nn.Linear(prev_dim, 1)
+            self.dropout = 0.1
+            
+        def forward(self, x):
+            # Functional ops on the layer parameters skip per-module call overhead;
+            # dropout is only applied in training mode
+            for layer in self.hidden_layers:
+                x = F.relu(F.linear(x, layer.weight, layer.bias))
+                x = F.dropout(x, self.dropout, training=self.training)
+            return F.linear(x, self.output_layer.weight, self.output_layer.bias)
+    
+    MINENetwork.__module__ = __name__
+    MINENetwork.__qualname__ = 'MINENetwork'
+    return MINENetwork
+
+
+def __getattr__(name: str):
+    """Resolve MINENetwork lazily (PEP 562)"""
+    if name == 'MINENetwork':
+        _load_torch()
+        return _network_class
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class MINEEstimator:
@@ -43,20 +83,65 @@ class MINEEstimator:
                  learning_rate: float = 0.001,
                  batch_size: int = 64,
                  epochs: int = 100,
-                 device: str = 'auto'):
+                 device: str = 'auto',
+                 convergence_window: int = 100,
+                 convergence_interval: int = 50,
+                 convergence_tol: float = 1e-3):
+        _load_torch()
+        
         self.learning_rate = learning_rate
         self.batch_size = batch_size
         self.epochs = epochs
         
+        # Every convergence_interval epochs, stop once the mean loss of the
+        # last window differs from the window before it by less than tol.
+        # Each check syncs with the device, and short runs (the extractor
+        # trains for 50 epochs per objective evaluation) never stop early
+        self.convergence_window = convergence_window
+        self.convergence_interval = convergence_interval
+        self.convergence_tol = convergence_tol
+        
         # Set device
         if device == 'auto':
             self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         else:
             self.device = torch.device(device)
         
+        # BF16 autocast for training on CUDA; CPU keeps full precision
+        self.use_amp = self.device.type == 'cuda'
+        
+        # Compile networks into fused kernels; on CPU compilation costs far
+        # more than the tiny MLP it would speed up
+        self.use_compile = self.device.type == 'cuda' and hasattr(torch, 'compile')
+        
         self.network = None
         self.optimizer = None
-        self.training_history = []
+        
+        # Per-epoch training losses of the last run, filled by index; the
+        # device buffer is copied to the host once per run
+        self._losses = np.empty(self.epochs, dtype=np.float32)
+        self._loss_buf = torch.empty(self.epochs, device=self.device)
+        self._num_recorded = 0
+        
+        # (network, optimizer) per input dimension, reused across calls
+        self._net_cache = {}
+        
+        # Fixed marginal permutations per sample count, kept on device
+        self._perm_cache = {}
+    
+    def probe(self):
+        """
+        Check that MINE networks can run on the configured device.
+        
+        Raises:
+            NotImplementedError: If a forward pass cannot be executed
+        """
+        try:
+            network = _network_class(2).to(self.device)
+            with torch.no_grad():
+                network(torch.zeros(1, 2, device=self.device))
+        except RuntimeError as e:
+            raise NotImplementedError(f"MINE unavailable on {self.device}: {e}") from e
     
     def estimate_mi(self, source: Any, resonance: np.ndarray) -> float:
         """
@@ -89,31 +174,63 @@ class MINEEstimator:
             
             return max(0.0, mi_estimate)  # MI is non-negative
             
-        except Exception as e:
-            # Fallback to simplified estimation
+        except (RuntimeError, ValueError):
+            # Training or sampling failed numerically; fall back to the
+            # simplified estimate. Other errors are bugs and propagate
             return self._simplified_mi_estimation(source, resonance)
     
+    def estimate_mi_with_gradient(self, source: Any, 
+                                  resonance: np.ndarray) -> Tuple[float, np.ndarray]:
+        """
+        Estimate mutual information and its gradient with respect to resonance.
+        
+        The MINE network is trained exactly as in estimate_mi and then held
+        fixed; the gradient of the resulting bound with respect to the
+        resonance inputs is obtained with autograd.
+        
+        Args:
+            source: Source data
+            resonance: Resonance vector
+            
+        Returns:
+            Tuple of (estimated mutual information, gradient w.r.t. resonance)
+        """
+        gradient = np.zeros(len(resonance))
+        
+        try:
+            # Convert source to numerical representation
+            source_vector = self._convert_to_vector(source)
+            
+            if source_vector is None or len(source_vector) == 0:
+                return 0.0, gradient
+            
+            # Ensure compatible dimensions
+            min_dims = min(len(source_vector), len(resonance))
+            source_vector = source_vector[:min_dims]
+            
+            # Train MINE network on joint and marginal samples
+            joint_samples, marginal_samples = self._create_samples(source_vector, resonance[:min_dims])
+            self._train_mine(joint_samples, marginal_samples)
+            
+            # Differentiate the trained bound with respect to resonance
+            mi_estimate, mi_gradient = self._mine_bound_gradient(source_vector, resonance[:min_dims])
+            
+            if mi_estimate <= 0.0:
+                return 0.0, gradient  # MI is non-negative
+            
+            gradient[:min_dims] = mi_gradient
+            return mi_estimate, gradient
+            
+        except (RuntimeError, ValueError):
+            # Same fallback as estimate_mi; it is constant in resonance, so
+            # its gradient is zero
+            return self._simplified_mi_estimation(source, resonance), gradient
+    
     def _convert_to_vector(self, source: Any) -> Optional[np.ndarray]:
         """Convert source data to numerical vector"""
         try:
             if isinstance(source, str):
-                # Convert string to character frequency vector
-                char_counts = {}
-                for char in source:
-                    char_counts[char] = char_counts.get(char, 0) + 1
-                
-                # Create frequency vector
-                max_chars = 256  # ASCII range
-                vector = np.zeros(max_chars)
-                for char, count in char_counts.items():
-                    if ord(char) < max_chars:
-                        vector[ord(char)] = count
-                
-                # Normalize
-                if np.sum(vector) > 0:
-                    vector = vector / np.sum(vector)
-                
-                return vector
+                return self._string_to_vector(source)
             
             elif isinstance(source, (list, tuple)):
                 # Convert list to numerical vector
@@ -124,9 +241,9 @@ class MINEEstimator:
                 try:
                     vector = np.array(source, dtype=float)
                     return vector
-                except:
-                    # Convert to string representation
-                    return self._convert_to_vector(str(source))
+                except (TypeError, ValueError):
+                    # Non-numeric or ragged: use the string representation directly
+                    return self._string_to_vector(str(source))
             
             elif isinstance(source, dict):
                 # Convert dict to vector
@@ -138,88 +255,176 @@ class MINEEstimator:
             
             else:
                 # Generic conversion
-                return self._convert_to_vector(str(source))
+                return self._string_to_vector(str(source))
                 
         except:
             return None
     
+    def _string_to_vector(self, text: str) -> np.ndarray:
+        """Character frequency vector over code points below 256"""
+        # Latin-1 maps code points below 256 to their byte value and drops the rest
+        max_chars = 256
+        code_points = np.frombuffer(text.encode('latin-1', 'ignore'), dtype=np.uint8)
+        vector = np.bincount(code_points, minlength=max_chars).astype(np.float64)
+        
+        # Normalize
+        total = vector.sum()
+        if total > 0:
+            vector /= total
+        
+        return vector
+    
     def _create_samples(self, source_vector: np.ndarray, 
-                       resonance: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
-        """Create joint and marginal samples for MINE"""
+                       resonance: np.ndarray) -> Tuple['torch.Tensor', 'torch.Tensor']:
+        """Create joint and marginal samples for MINE on the training device"""
         
         # Ensure same length
         min_len = min(len(source_vector), len(resonance))
-        source_vector = source_vector[:min_len]
-        resonance = resonance[:min_len]
+        source_tensor = torch.as_tensor(source_vector[:min_len], dtype=torch.float32, device=self.device)
+        resonance_tensor = torch.as_tensor(resonance[:min_len], dtype=torch.float32, device=self.device)
         
         # Create joint samples (X, Y)
-        joint_samples = np.column_stack([source_vector, resonance])
+        joint_samples = torch.stack([source_tensor, resonance_tensor], dim=1)
         
         # Create marginal samples (X, Y') where Y' is shuffled
-        np.random.seed(42)  # For reproducibility
-        shuffled_resonance = np.random.permutation(resonance)
-        marginal_samples = np.column_stack([source_vector, shuffled_resonance])
+        shuffled_resonance = resonance_tensor[self._marginal_permutation(min_len)]
+        marginal_samples = torch.stack([source_tensor, shuffled_resonance], dim=1)
         
         return joint_samples, marginal_samples
     
-    def _train_mine(self, joint_samples: np.ndarray, 
-                   marginal_samples: np.ndarray) -> float:
+    def _marginal_permutation(self, length: int) -> 'torch.Tensor':
+        """Permutation used to build marginal samples"""
+        if length not in self._perm_cache:
+            # Seeded local generator for reproducibility without touching global RNG state
+            generator = torch.Generator(device=self.device).manual_seed(42)
+            self._perm_cache[length] = torch.randperm(
+                length, generator=generator, device=self.device
+            )
+        return self._perm_cache[length]
+    
+    def _train_mine(self, joint_tensor: 'torch.Tensor', 
+                   marginal_tensor: 'torch.Tensor') -> float:
         """Train MINE network to estimate mutual information"""
         
-        # Convert to tensors
-        joint_tensor = torch.FloatTensor(joint_samples).to(self.device)
-        marginal_tensor = torch.FloatTensor(marginal_samples).to(self.device)
-        
-        # Initialize network
-        input_dim = joint_samples.shape[1]
-        self.network = MINENetwork(input_dim).to(self.device)
-        self.optimizer = optim.Adam(self.network.parameters(), lr=self.learning_rate)
+        # Reuse the network for this input dimension; the previous statistics
+        # network is a warm start for the nearby distribution
+        input_dim = joint_tensor.shape[1]
+        if input_dim not in self._net_cache:
+            network = _network_class(input_dim).to(self.device)
+            optimizer = optim.Adam(network.parameters(), lr=self.learning_rate)
+            if self.use_compile:
+                # The network sees mini-batches, the full sample set and the
+                # requires_grad inputs of the bound gradient, in train and eval
+                # mode. Dynamic shapes and no CUDA graph capture keep that to
+                # one graph per mode instead of one per shape and mode
+                network = torch.compile(network, dynamic=True)
+            self._net_cache[input_dim] = (network, optimizer)
+        self.network, self.optimizer = self._net_cache[input_dim]
+        self.network.train()
         
         # Training loop
-        self.training_history = []
+        if len(self._losses) != self.epochs:
+            self._losses = np.empty(self.epochs, dtype=np.float32)
+            self._loss_buf = torch.empty(self.epochs, device=self.device)
+        self._num_recorded = 0
+        num_samples = len(joint_tensor)
+        batch_size = min(self.batch_size, num_samples)
+        if batch_size < num_samples:
+            # Joint and marginal batch indices, refilled in place each epoch
+            batch_indices = torch.empty((2, batch_size), dtype=torch.long, device=self.device)
         
         for epoch in range(self.epochs):
-            # Shuffle data
-            joint_indices = torch.randperm(len(joint_tensor))
-            marginal_indices = torch.randperm(len(marginal_tensor))
-            
-            joint_shuffled = joint_tensor[joint_indices]
-            marginal_shuffled = marginal_tensor[marginal_indices]
+            # Sample a mini-batch; the loss is order-invariant, so samples
+            # that fit in one batch are used as-is
+            if batch_size < num_samples:
+                batch_indices.random_(0, num_samples)
+                joint_batch = joint_tensor[batch_indices[0]]
+                marginal_batch = marginal_tensor[batch_indices[1]]
+            else:
+                joint_batch, marginal_batch = joint_tensor, marginal_tensor
             
             # Compute MINE loss
-            joint_scores = self.network(joint_shuffled)
-            marginal_scores = self.network(marginal_shuffled)
-            
-            # MINE loss: -E[T(x,y)] + log(E[exp(T(x,y'))])
-            joint_loss = -torch.mean(joint_scores)
-            marginal_loss = torch.log(torch.mean(torch.exp(marginal_scores)))
-            
-            mine_loss = joint_loss + marginal_loss
+            with self._autocast():
+                joint_scores = self.network(joint_batch)
+                marginal_scores = self.network(marginal_batch)
+                
+                # MINE loss: -E[T(x,y)] + log(E[exp(T(x,y'))])
+                mine_loss = (self._log_mean_exp(marginal_scores) - joint_scores.mean()).float()
             
             # Backward pass
             self.optimizer.zero_grad()
             mine_loss.backward()
             self.optimizer.step()
             
-            # Record training history
-            self.training_history.append({
-                'epoch': epoch,
-                'loss': mine_loss.item(),
-                'mi_estimate': mine_loss.item()
-            })
+            # Record training history without a per-epoch device sync
+            self._loss_buf[epoch] = mine_loss.detach()
+            self._num_recorded = epoch + 1
+            
+            # Early stopping, synchronizing only once per window
+            if self._has_converged(self._num_recorded):
+                break
+        
+        self._losses[:self._num_recorded] = self._loss_buf[:self._num_recorded].cpu().numpy()
         
-        # Return final MI estimate
-        with torch.no_grad():
+        # Return final MI estimate with dropout disabled
+        self.network.eval()
+        with torch.no_grad(), self._autocast():
             joint_scores = self.network(joint_tensor)
             marginal_scores = self.network(marginal_tensor)
             
             joint_mean = torch.mean(joint_scores)
-            marginal_mean = torch.log(torch.mean(torch.exp(marginal_scores)))
+            marginal_mean = self._log_mean_exp(marginal_scores)
             
-            mi_estimate = joint_mean + marginal_mean
+            mi_estimate = (joint_mean + marginal_mean).float()
         
         return mi_estimate.item()
     
+    def _has_converged(self, num_recorded: int) -> bool:
+        """
+        Compare the mean loss of the last window with the one before it.
+        
+        Checked only every convergence_interval epochs and once a full window
+        plus part of the previous one has been recorded; the previous window
+        is truncated at the first epoch.
+        """
+        window, interval = self.convergence_window, self.convergence_interval
+        if (window <= 0 or interval <= 0 or num_recorded % interval != 0
+                or num_recorded <= window):
+            return False
+        recent = self._loss_buf[num_recorded - window:num_recorded].mean()
+        previous = self._loss_buf[max(0, num_recorded - 2 * window):num_recorded - window].mean()
+        return torch.abs(recent - previous).item() < self.convergence_tol
+    
+    def _autocast(self) -> 'torch.autocast':
+        """Mixed-precision context for MINE forward passes"""
+        return torch.autocast(device_type=self.device.type, dtype=torch.bfloat16,
+                              enabled=self.use_amp)
+    
+    def _log_mean_exp(self, scores: 'torch.Tensor') -> 'torch.Tensor':
+        """log(mean(exp(scores))) computed stably with logsumexp"""
+        return torch.logsumexp(scores.squeeze(-1), dim=0) - math.log(scores.shape[0])
+    
+    def _mine_bound_gradient(self, source_vector: np.ndarray, 
+                             resonance: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Evaluate the trained MINE bound and its gradient w.r.t. resonance"""
+        source_tensor = torch.as_tensor(source_vector, dtype=torch.float32, device=self.device)
+        resonance_tensor = torch.tensor(resonance, dtype=torch.float32, device=self.device,
+                                        requires_grad=True)
+        permutation = self._marginal_permutation(len(resonance))
+        
+        joint_tensor = torch.stack([source_tensor, resonance_tensor], dim=1)
+        marginal_tensor = torch.stack([source_tensor, resonance_tensor[permutation]], dim=1)
+        
+        # Evaluate with the trained network held fixed
+        self.network.eval()
+        joint_mean = torch.mean(self.network(joint_tensor))
+        marginal_mean = self._log_mean_exp(self.network(marginal_tensor))
+        mi_estimate = joint_mean + marginal_mean
+        mi_estimate.backward()
+        
+        gradient = resonance_tensor.grad.detach().cpu().numpy().astype(np.float64)
+        return mi_estimate.item(), gradient
+    
     def _simplified_mi_estimation(self, source: Any, resonance: np.ndarray) -> float:
         """Simplified mutual information estimation as fallback"""
         try:
@@ -243,34 +448,21 @@ class MINEEstimator:
         try:
             if isinstance(data, str):
                 # Character-level entropy
-                char_counts = {}
-                for char in data:
-                    char_counts[char] = char_counts.get(char, 0) + 1
-                
-                probs = np.array(list(char_counts.values())) / len(data)
-                probs = probs[probs > 0]  # Remove zero probabilities
-                
-                if len(probs) == 0:
+                if not data:
                     return 0.0
+                if data.isascii():
+                    # One byte per character, so a byte histogram counts characters
+                    counts = np.bincount(np.frombuffer(data.encode('ascii'), dtype=np.uint8))
+                else:
+                    char_counts = Counter(data)
+                    counts = np.fromiter(char_counts.values(), dtype=np.int64, count=len(char_counts))
                 
-                return -np.sum(probs * np.log2(probs))
+                return float(kernels.shannon_entropy(counts / len(data)))
             
             elif isinstance(data, np.ndarray):
-                # Array entropy
-                if len(data) == 0:
-                    return 0.0
-                
-                # Discretize continuous data
-                data_discrete = np.digitize(data, bins=np.linspace(data.min(), data.max(), 10))
-                
-                unique, counts = np.unique(data_discrete, return_counts=True)
-                probs = counts / len(data_discrete)
-                probs = probs[probs > 0]
-                
-                if len(probs) == 0:
-                    return 0.0
-                
-                return -np.sum(probs * np.log2(probs))
+                # Array entropy over 10 evenly spaced bins, in one histogram pass
+                values = np.ascontiguousarray(data, dtype=np.float64).ravel()
+                return float(kernels.histogram_entropy(values, 10))
             
             else:
                 return 0.0
@@ -278,19 +470,27 @@ class MINEEstimator:
         except:
             return 0.0
     
+    @property
+    def training_history(self) -> List[Dict[str, Any]]:
+        """Per-epoch records of the last training run"""
+        return [
+            {'epoch': epoch, 'loss': float(loss), 'mi_estimate': float(loss)}
+            for epoch, loss in enumerate(self._losses[:self._num_recorded])
+        ]
+    
     def get_training_summary(self) -> Dict[str, Any]:
         """Get training summary"""
-        if not self.training_history:
+        if self._num_recorded == 0:
             return {}
         
-        losses = [h['loss'] for h in self.training_history]
-        mi_estimates = [h['mi_estimate'] for h in self.training_history]
+        # The per-epoch MI estimate is recorded as the training loss
+        losses = self._losses[:self._num_recorded]
         
         return {
-            'epochs': len(self.training_history),
-            'final_loss': losses[-1] if losses else 0,
-            'final_mi_estimate': mi_estimates[-1] if mi_estimates else 0,
-            'min_loss': min(losses) if losses else 0,
-            'max_mi_estimate': max(mi_estimates) if mi_estimates else 0,
-            'converged': len(losses) > 10 and abs(losses[-1] - losses[-10]) < 0.001
+            'epochs': len(losses),
+            'final_loss': float(losses[-1]),
+            'final_mi_estimate': float(losses[-1]),
+            'min_loss': float(losses.min()),
+            'max_mi_estimate': float(losses.max()),
+            'converged': len(losses) > 10 and abs(float(losses[-1]) - float(losses[-10])) < 0.001
         }
\ No newline at end of file
@@ -5,22 +5,223 @@ This module provides enhanced security through TEE implementations
 including Intel SGX, ARM TrustZone, and software-based alternatives.
 """
 
+import functools
+import hmac
+import logging
 import os
+import platform
 import hashlib
 import time
-import secrets
+import struct
 import ctypes
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+
+logger = logging.getLogger(__name__)
+
+# CPU feature flags that indicate ARM TrustZone
+TRUSTZONE_INDICATORS = ('trustzone', 'tz')
+
+# Capabilities reported in each backend's attestation
+SGX_ATTESTED_CAPABILITIES = ('secure_memory', 'attestation', 'secure_deletion')
+TRUSTZONE_ATTESTED_CAPABILITIES = ('secure_objects', 'attestation', 'secure_deletion', 'encryption')
+
+
+@functools.lru_cache(maxsize=1)
+def _cpu_flags() -> FrozenSet[str]:
+    """Lower-cased feature flags from /proc/cpuinfo, parsed once per process"""
+    flags = set()
+    try:
+        with open('/proc/cpuinfo', 'rb') as f:
+            for line in f:
+                # x86 lists features under 'flags', ARM under 'Features'
+                key, sep, value = line.partition(b':')
+                if sep and key.strip().lower() in (b'flags', b'features'):
+                    flags.update(value.decode('ascii', 'ignore').lower().split())
+    except OSError:
+        pass
+    return frozenset(flags)
+
+
+@functools.lru_cache(maxsize=1)
+def _cpu_name_windows() -> str:
+    """Processor brand string from the registry ('' if unavailable)"""
+    try:
+        import winreg
+        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
+                            r'HARDWARE\DESCRIPTION\System\CentralProcessor\0') as key:
+            return str(winreg.QueryValueEx(key, 'ProcessorNameString')[0])
+    except (ImportError, OSError):
+        return ''
+
+
+@functools.lru_cache(maxsize=1)
+def _wmi_processors() -> Tuple[Any, ...]:
+    """Win32_Processor records, queried once per process"""
+    import wmi
+    return tuple(wmi.WMI().Win32_Processor())
+
+
+class _IdentifierPool:
+    """
+    Batched os.urandom output for enclave, memory, object and container ids.
+    
+    Identifiers are not key material, so one 4 KiB draw serves hundreds of
+    them; nonces and overwrite data still come straight from the OS.
+    """
+    
+    def __init__(self, size: int = 4096):
+        self._size = size
+        self._buffer = b''
+        self._offset = 0
+        self._lock = threading.Lock()
+    
+    def take(self, n: int) -> bytes:
+        """Next n random bytes, refilling the pool when exhausted"""
+        with self._lock:
+            if self._offset + n > len(self._buffer):
+                self._buffer = os.urandom(max(self._size, n))
+                self._offset = 0
+            chunk = self._buffer[self._offset:self._offset + n]
+            self._offset += n
+            return chunk
+    
+    def randbits(self, bits: int) -> int:
+        """Random non-negative integer below 2**bits (bits a multiple of 8)"""
+        return int.from_bytes(self.take(bits // 8), 'little')
+    
+    def token_hex(self, nbytes: int) -> str:
+        """Random hex identifier of nbytes bytes"""
+        return self.take(nbytes).hex()
+
+
+_ID_POOL = _IdentifierPool()
+
+
+def _measurement(identity: int, timestamp: float) -> str:
+    """BLAKE2b digest of a 64-bit TEE identity and attestation time"""
+    hasher = hashlib.blake2b(digest_size=32)
+    hasher.update(identity.to_bytes(8, 'little'))
+    hasher.update(struct.pack('<d', timestamp))
+    return hasher.hexdigest()
+
+
+def _to_bytes(data: Any) -> bytes:
+    """Bytes payload of data for the TEE backends"""
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, (bytearray, memoryview)):
+        return bytes(data)
+    if isinstance(data, str):
+        return data.encode('utf-8')
+    return str(data).encode('utf-8')
+
+
+# A single overwrite purges RAM (NIST SP 800-88); the historical multi-pass
+# patterns target magnetic media and only run when a backend is paranoid
+def _wipe(buffer: bytearray, value: int):
+    """Fill a bytearray in place with one byte value via a single memset"""
+    if buffer:
+        ctypes.memset((ctypes.c_char * len(buffer)).from_buffer(buffer), value, len(buffer))
+
+
+# Bytes of CSPRNG output drawn per step of an in-place random pass
+RANDOM_FILL_CHUNK = 64 * 1024
+
+
+def _random_fill(buffer: bytearray):
+    """Overwrite a bytearray with CSPRNG bytes in bounded chunks, no full-size copy"""
+    with memoryview(buffer) as view:
+        for start in range(0, len(view), RANDOM_FILL_CHUNK):
+            chunk = view[start:start + RANDOM_FILL_CHUNK]
+            chunk[:] = os.urandom(len(chunk))
+
+
+def _bulk_wipe(store: Dict[Any, Any], field: Optional[str] = None):
+    """Zero every buffer in a backend store in one sweep, then empty it"""
+    for entry in store.values():
+        if field:
+            _wipe(getattr(entry, field), 0x00)
+            entry.drop_aead()
+        else:
+            _wipe(entry, 0x00)
+    store.clear()
+
+
+class _KeyedRecord:
+    """
+    Backend record that keeps the AES-GCM context of its last key.
+    
+    The context (and its expanded key schedule) lives only as long as the
+    record, so deleting the record ends the key's lifetime as well.
+    """
+    
+    __slots__ = ('_aead', '_aead_key')
+    
+    def __init__(self):
+        self._aead = None
+        self._aead_key = None
+    
+    def aead(self, key: bytes) -> AESGCM:
+        """AES-GCM context for key, reused while the record keeps that key"""
+        if self._aead is None or not hmac.compare_digest(self._aead_key, key):
+            self._aead = AESGCM(key)
+            self._aead_key = key
+        return self._aead
+    
+    def drop_aead(self):
+        """Release the cached context and key reference"""
+        self._aead = None
+        self._aead_key = None
+
+
+class SecureObject(_KeyedRecord):
+    """TrustZone secure object record"""
+    
+    __slots__ = ('type', 'data', 'created')
+    
+    def __init__(self, object_type: str, data: bytearray, created: float):
+        super().__init__()
+        self.type = object_type
+        self.data = data
+        self.created = created
+
+
+class SecureContainer(_KeyedRecord):
+    """Software TEE container record"""
+    
+    __slots__ = ('data', 'created', 'access_count')
+    
+    def __init__(self, data: bytearray, created: float, access_count: int = 0):
+        super().__init__()
+        self.data = data
+        self.created = created
+        self.access_count = access_count
+
+
+class CapabilityRecord(NamedTuple):
+    """Feature availability reported by TEECapabilities"""
+    sgx: bool
+    trustzone: bool
+    software_tee: bool
+    secure_memory: bool
+    attestation: bool
+    secure_deletion: bool
 
 
 class TEECapabilities:
     """TEE capabilities detection and management"""
     
+    # Hardware detection results, shared process-wide after the first probe
+    _detected: Optional[Tuple[bool, bool]] = None
+    
     def __init__(self):
-        self.sgx_available = self._detect_sgx()
-        self.trustzone_available = self._detect_trustzone()
+        if TEECapabilities._detected is None:
+            TEECapabilities._detected = (self._detect_sgx(), self._detect_trustzone())
+        self.sgx_available, self.trustzone_available = TEECapabilities._detected
         self.software_tee_available = True  # Always available as fallback
         self.capabilities = self._get_capabilities()
     
@@ -38,9 +239,11 @@ class TEECapabilities:
     def _check_sgx_windows(self) -> bool:
         """Check SGX on Windows"""
         try:
-            import wmi
-            c = wmi.WMI()
-            for processor in c.Win32_Processor():
+            # SGX is Intel-only; rule out other vendors before starting WMI
+            cpu_name = _cpu_name_windows()
+            if cpu_name and 'intel' not in cpu_name.lower():
+                return False
+            for processor in _wmi_processors():
                 if 'SGX' in str(processor.ProcessorId):
                     return True
             return False
@@ -50,9 +253,7 @@ class TEECapabilities:
     def _check_sgx_linux(self) -> bool:
         """Check SGX on Linux"""
         try:
-            with open('/proc/cpuinfo', 'r') as f:
-                cpuinfo = f.read()
-                return 'sgx' in cpuinfo.lower()
+            return 'sgx' in _cpu_flags()
         except:
             return False
     
@@ -69,9 +270,10 @@ class TEECapabilities:
     def _check_trustzone_windows(self) -> bool:
         """Check TrustZone on Windows"""
         try:
-            import wmi
-            c = wmi.WMI()
-            for processor in c.Win32_Processor():
+            # TrustZone is ARM-only; rule out other architectures before WMI
+            if not platform.machine().upper().startswith('ARM'):
+                return False
+            for processor in _wmi_processors():
                 if 'ARM' in str(processor.Architecture) and 'TrustZone' in str(processor.ProcessorId):
                     return True
             return False
@@ -81,27 +283,30 @@ class TEECapabilities:
     def _check_trustzone_linux(self) -> bool:
         """Check TrustZone on Linux"""
         try:
-            with open('/proc/cpuinfo', 'r') as f:
-                cpuinfo = f.read()
-                return 'trustzone' in cpuinfo.lower() or 'tz' in cpuinfo.lower()
+            flags = _cpu_flags()
+            return any(indicator in flags for indicator in TRUSTZONE_INDICATORS)
         except:
             return False
     
-    def _get_capabilities(self) -> Dict[str, bool]:
+    def _get_capabilities(self) -> CapabilityRecord:
         """Get TEE capabilities"""
-        return {
-            'sgx': self.sgx_available,
-            'trustzone': self.trustzone_available,
-            'software_tee': self.software_tee_available,
-            'secure_memory': self.sgx_available or self.trustzone_available,
-            'attestation': self.sgx_available or self.trustzone_available,
-            'secure_deletion': True  # Always available
-        }
+        hardware_tee = self.sgx_available or self.trustzone_available
+        return CapabilityRecord(
+            sgx=self.sgx_available,
+            trustzone=self.trustzone_available,
+            software_tee=self.software_tee_available,
+            secure_memory=hardware_tee,
+            attestation=hardware_tee,
+            secure_deletion=True  # Always available
+        )
 
 
 class SGXEnclave:
     """Intel SGX Enclave implementation"""
     
+    # Multi-pass overwrite before the final zero pass
+    paranoid = False
+    
     def __init__(self):
         self.enclave_id = None
         self.initialized = False
@@ -111,7 +316,7 @@ class SGXEnclave:
         """Initialize SGX enclave"""
         try:
             # Simulate SGX enclave initialization
-            self.enclave_id = secrets.randbits(64)
+            self.enclave_id = _ID_POOL.randbits(64)
             self.initialized = True
             return True
         except:
@@ -123,7 +328,7 @@ class SGXEnclave:
             return None
         
         # Simulate secure memory allocation
-        memory_id = secrets.randbits(32)
+        memory_id = _ID_POOL.randbits(32)
         self.secure_memory[memory_id] = bytearray(size)
         return memory_id
     
@@ -144,31 +349,46 @@ class SGXEnclave:
             return b''
         
         try:
-            return bytes(self.secure_memory[memory_id][offset:offset+size])
+            with memoryview(self.secure_memory[memory_id]) as memory:
+                return bytes(memory[offset:offset+size])
         except:
             return b''
     
+    def secure_read_into(self, buffer: Any, memory_id: int, offset: int = 0) -> int:
+        """Copy secure memory into a caller-provided buffer; returns bytes copied"""
+        if memory_id not in self.secure_memory:
+            return 0
+        
+        try:
+            with memoryview(self.secure_memory[memory_id]) as memory, \
+                 memoryview(buffer).cast('B') as out:
+                chunk = memory[offset:offset+len(out)]
+                out[:len(chunk)] = chunk
+                return len(chunk)
+        except:
+            return 0
+    
     def secure_delete(self, memory_id: int) -> bool:
         """Securely delete memory in enclave"""
         if memory_id not in self.secure_memory:
             return False
         
         try:
-            # Multi-pass secure deletion
             memory = self.secure_memory[memory_id]
             
-            # Pass 1: All zeros
-            memory[:] = b'\x00' * len(memory)
-            
-            # Pass 2: All ones
-            memory[:] = b'\xFF' * len(memory)
-            
-            # Pass 3: Random pattern
-            random_data = secrets.token_bytes(len(memory))
-            memory[:] = random_data
+            if self.paranoid:
+                # Multi-pass secure deletion
+                # Pass 1: All zeros
+                _wipe(memory, 0x00)
+                
+                # Pass 2: All ones
+                _wipe(memory, 0xFF)
+                
+                # Pass 3: Random pattern
+                _random_fill(memory)
             
-            # Pass 4: All zeros again
-            memory[:] = b'\x00' * len(memory)
+            # Final pass: All zeros
+            _wipe(memory, 0x00)
             
             # Remove from secure memory
             del self.secure_memory[memory_id]
@@ -182,17 +402,21 @@ class SGXEnclave:
         if not self.initialized:
             return {}
         
+        now = time.time()
         return {
             'enclave_id': self.enclave_id,
-            'timestamp': time.time(),
-            'measurement': hashlib.sha256(f"{self.enclave_id}_{time.time()}".encode()).hexdigest(),
-            'capabilities': ['secure_memory', 'attestation', 'secure_deletion']
+            'timestamp': now,
+            'measurement': _measurement(self.enclave_id, now),
+            'capabilities': list(SGX_ATTESTED_CAPABILITIES)
         }
 
 
 class TrustZoneSecureWorld:
     """ARM TrustZone Secure World implementation"""
     
+    # Multi-pass overwrite before the final zero pass
+    paranoid = False
+    
     def __init__(self):
         self.secure_world_id = None
         self.initialized = False
@@ -202,7 +426,7 @@ class TrustZoneSecureWorld:
         """Initialize TrustZone Secure World"""
         try:
             # Simulate TrustZone initialization
-            self.secure_world_id = secrets.randbits(64)
+            self.secure_world_id = _ID_POOL.randbits(64)
             self.initialized = True
             return True
         except:
@@ -213,12 +437,8 @@ class TrustZoneSecureWorld:
         if not self.initialized:
             return None
         
-        object_id = secrets.token_hex(16)
-        self.secure_objects[object_id] = {
-            'type': object_type,
-            'data': bytearray(data),
-            'created': time.time()
-        }
+        object_id = _ID_POOL.token_hex(16)
+        self.secure_objects[object_id] = SecureObject(object_type, bytearray(data), time.time())
         return object_id
     
     def secure_operate(self, object_id: str, operation: str, **kwargs) -> Any:
@@ -226,22 +446,17 @@ class TrustZoneSecureWorld:
         if object_id not in self.secure_objects:
             return None
         
-        obj = self.secure_objects[object_id]
-        
-        if operation == 'read':
-            return bytes(obj['data'])
-        elif operation == 'write':
-            new_data = kwargs.get('data', b'')
-            obj['data'][:] = new_data
-            return True
-        elif operation == 'delete':
-            return self._secure_delete_object(object_id)
-        elif operation == 'encrypt':
-            return self._encrypt_object(object_id, kwargs.get('key', b''))
-        elif operation == 'decrypt':
-            return self._decrypt_object(object_id, kwargs.get('key', b''))
-        
-        return None
+        handler = self._OPERATIONS.get(operation)
+        return handler(self, object_id, **kwargs) if handler else None
+    
+    def _read_object(self, object_id: str, **kwargs) -> bytes:
+        """Copy of the object's data"""
+        return bytes(self.secure_objects[object_id].data)
+    
+    def _write_object(self, object_id: str, **kwargs) -> bool:
+        """Replace the object's data in place"""
+        self.secure_objects[object_id].data[:] = kwargs.get('data', b'')
+        return True
     
     def _secure_delete_object(self, object_id: str) -> bool:
         """Securely delete object"""
@@ -250,23 +465,24 @@ class TrustZoneSecureWorld:
         
         try:
             obj = self.secure_objects[object_id]
-            data = obj['data']
+            data = obj.data
             
-            # Multi-pass secure deletion
-            # Pass 1: All zeros
-            data[:] = b'\x00' * len(data)
+            if self.paranoid:
+                # Multi-pass secure deletion
+                # Pass 1: All zeros
+                _wipe(data, 0x00)
+                
+                # Pass 2: All ones
+                _wipe(data, 0xFF)
+                
+                # Pass 3: Random pattern
+                _random_fill(data)
             
-            # Pass 2: All ones
-            data[:] = b'\xFF' * len(data)
+            # Final pass: All zeros
+            _wipe(data, 0x00)
             
-            # Pass 3: Random pattern
-            random_data = secrets.token_bytes(len(data))
-            data[:] = random_data
-            
-            # Pass 4: All zeros again
-            data[:] = b'\x00' * len(data)
-            
-            # Remove object
+            # Remove object along with its key context
+            obj.drop_aead()
             del self.secure_objects[object_id]
             
             return True
@@ -279,15 +495,28 @@ class TrustZoneSecureWorld:
             return b''
         
         obj = self.secure_objects[object_id]
-        data = bytes(obj['data'])
-        
-        # Use AES-GCM for encryption
-        iv = secrets.token_bytes(16)
-        cipher = Cipher(algorithms.AES(key), modes.GCM(iv))
-        encryptor = cipher.encryptor()
         
-        ciphertext = encryptor.update(data) + encryptor.finalize()
-        return iv + encryptor.tag + ciphertext
+        # Use AES-GCM with a 96-bit nonce; the tag is appended to the ciphertext
+        iv = os.urandom(12)
+        with memoryview(obj.data) as data:
+            return iv + obj.aead(key).encrypt(iv, data, None)
+    
+    def bulk_encrypt(self, object_ids: List[str], key: bytes) -> List[bytes]:
+        """Encrypt many objects under one key; unknown ids yield b''"""
+        # One context for the whole batch, released when the call returns
+        aead = AESGCM(key)
+        nonces = os.urandom(12 * len(object_ids))
+        
+        results = []
+        for i, object_id in enumerate(object_ids):
+            obj = self.secure_objects.get(object_id)
+            if obj is None:
+                results.append(b'')
+                continue
+            iv = nonces[12 * i:12 * i + 12]
+            with memoryview(obj.data) as data:
+                results.append(iv + aead.encrypt(iv, data, None))
+        return results
     
     def _decrypt_object(self, object_id: str, key: bytes) -> bytes:
         """Decrypt object data"""
@@ -295,42 +524,50 @@ class TrustZoneSecureWorld:
             return b''
         
         obj = self.secure_objects[object_id]
-        encrypted_data = bytes(obj['data'])
         
-        if len(encrypted_data) < 32:  # IV + tag + data
+        if len(obj.data) < 28:  # IV + tag
             return b''
         
-        # Extract IV, tag, and ciphertext
-        iv = encrypted_data[:16]
-        tag = encrypted_data[16:32]
-        ciphertext = encrypted_data[32:]
-        
-        # Decrypt
-        cipher = Cipher(algorithms.AES(key), modes.GCM(iv, tag))
-        decryptor = cipher.decryptor()
-        
-        try:
-            return decryptor.update(ciphertext) + decryptor.finalize()
-        except:
-            return b''
+        # Extract IV; the ciphertext carries its tag at the end
+        with memoryview(obj.data) as encrypted_data:
+            iv = bytes(encrypted_data[:12])
+            
+            # Decrypt
+            try:
+                return obj.aead(key).decrypt(iv, encrypted_data[12:], None)
+            except:
+                return b''
     
     def attest(self) -> Dict[str, Any]:
         """Generate TrustZone attestation"""
         if not self.initialized:
             return {}
         
+        now = time.time()
         return {
             'secure_world_id': self.secure_world_id,
-            'timestamp': time.time(),
-            'measurement': hashlib.sha256(f"{self.secure_world_id}_{time.time()}".encode()).hexdigest(),
+            'timestamp': now,
+            'measurement': _measurement(self.secure_world_id, now),
             'object_count': len(self.secure_objects),
-            'capabilities': ['secure_objects', 'attestation', 'secure_deletion', 'encryption']
+            'capabilities': list(TRUSTZONE_ATTESTED_CAPABILITIES)
         }
+    
+    # secure_operate dispatch table: operation name -> handler(self, object_id, **kwargs)
+    _OPERATIONS = {
+        'read': _read_object,
+        'write': _write_object,
+        'delete': lambda self, object_id, **kwargs: self._secure_delete_object(object_id),
+        'encrypt': lambda self, object_id, **kwargs: self._encrypt_object(object_id, kwargs.get('key', b'')),
+        'decrypt': lambda self, object_id, **kwargs: self._decrypt_object(object_id, kwargs.get('key', b'')),
+    }
 
 
 class SoftwareTEE:
     """Software-based TEE implementation (fallback)"""
     
+    # Multi-pass overwrite before the final zero pass
+    paranoid = False
+    
     def __init__(self):
         self.initialized = False
         self.secure_containers = {}
@@ -342,12 +579,8 @@ class SoftwareTEE:
     
     def create_secure_container(self, data: bytes) -> str:
         """Create secure container for data"""
-        container_id = secrets.token_hex(16)
-        self.secure_containers[container_id] = {
-            'data': bytearray(data),
-            'created': time.time(),
-            'access_count': 0
-        }
+        container_id = _ID_POOL.token_hex(16)
+        self.secure_containers[container_id] = SecureContainer(bytearray(data), time.time())
         return container_id
     
     def secure_operate(self, container_id: str, operation: str, **kwargs) -> Any:
@@ -355,21 +588,19 @@ class SoftwareTEE:
         if container_id not in self.secure_containers:
             return None
         
-        container = self.secure_containers[container_id]
-        container['access_count'] += 1
+        self.secure_containers[container_id].access_count += 1
         
-        if operation == 'read':
-            return bytes(container['data'])
-        elif operation == 'write':
-            new_data = kwargs.get('data', b'')
-            container['data'][:] = new_data
-            return True
-        elif operation == 'delete':
-            return self._secure_delete_container(container_id)
-        elif operation == 'encrypt':
-            return self._encrypt_container(container_id, kwargs.get('key', b''))
-        
-        return None
+        handler = self._OPERATIONS.get(operation)
+        return handler(self, container_id, **kwargs) if handler else None
+    
+    def _read_container(self, container_id: str, **kwargs) -> bytes:
+        """Copy of the container's data"""
+        return bytes(self.secure_containers[container_id].data)
+    
+    def _write_container(self, container_id: str, **kwargs) -> bool:
+        """Replace the container's data in place"""
+        self.secure_containers[container_id].data[:] = kwargs.get('data', b'')
+        return True
     
     def _secure_delete_container(self, container_id: str) -> bool:
         """Securely delete container"""
@@ -378,17 +609,18 @@ class SoftwareTEE:
         
         try:
             container = self.secure_containers[container_id]
-            data = container['data']
+            data = container.data
             
-            # Multi-pass secure deletion
-            for _ in range(7):  # Gutmann's algorithm
-                random_data = secrets.token_bytes(len(data))
-                data[:] = random_data
+            if self.paranoid:
+                # Multi-pass secure deletion
+                for _ in range(7):  # Gutmann's algorithm
+                    _random_fill(data)
             
             # Final zero pass
-            data[:] = b'\x00' * len(data)
+            _wipe(data, 0x00)
             
-            # Remove container
+            # Remove container along with its key context
+            container.drop_aead()
             del self.secure_containers[container_id]
             
             return True
@@ -401,48 +633,83 @@ class SoftwareTEE:
             return b''
         
         container = self.secure_containers[container_id]
-        data = bytes(container['data'])
-        
-        # Use AES-GCM for encryption
-        iv = secrets.token_bytes(16)
-        cipher = Cipher(algorithms.AES(key), modes.GCM(iv))
-        encryptor = cipher.encryptor()
         
-        ciphertext = encryptor.update(data) + encryptor.finalize()
-        return iv + encryptor.tag + ciphertext
+        # Use AES-GCM with a 96-bit nonce; the tag is appended to the ciphertext
+        iv = os.urandom(12)
+        with memoryview(container.data) as data:
+            return iv + container.aead(key).encrypt(iv, data, None)
+    
+    def bulk_encrypt(self, container_ids: List[str], key: bytes) -> List[bytes]:
+        """Encrypt many containers under one key; unknown ids yield b''"""
+        # One context for the whole batch, released when the call returns
+        aead = AESGCM(key)
+        nonces = os.urandom(12 * len(container_ids))
+        
+        results = []
+        for i, container_id in enumerate(container_ids):
+            container = self.secure_containers.get(container_id)
+            if container is None:
+                results.append(b'')
+                continue
+            container.access_count += 1
+            iv = nonces[12 * i:12 * i + 12]
+            with memoryview(container.data) as data:
+                results.append(iv + aead.encrypt(iv, data, None))
+        return results
+    
+    # secure_operate dispatch table: operation name -> handler(self, container_id, **kwargs)
+    _OPERATIONS = {
+        'read': _read_container,
+        'write': _write_container,
+        'delete': lambda self, container_id, **kwargs: self._secure_delete_container(container_id),
+        'encrypt': lambda self, container_id, **kwargs: self._encrypt_container(container_id, kwargs.get('key', b'')),
+    }
 
 
 class TEESupport:
     """Main TEE support class"""
     
     def __init__(self):
-        self.capabilities = TEECapabilities()
         self.sgx_enclave = None
         self.trustzone_sw = None
         self.software_tee = None
-        self.active_tee = None
         
-        # Initialize available TEE
-        self._initialize_tee()
+        # Detection and backend setup are deferred until the TEE is first used
+        self._active_tee = None
+        self._tee_initialized = False
+    
+    @functools.cached_property
+    def capabilities(self) -> TEECapabilities:
+        """Hardware TEE capabilities, detected on first access"""
+        return TEECapabilities()
+    
+    @property
+    def active_tee(self) -> Optional[str]:
+        """Active TEE type, initializing the best available TEE on first access"""
+        if not self._tee_initialized:
+            self._initialize_tee()
+        return self._active_tee
     
     def _initialize_tee(self):
         """Initialize the best available TEE"""
+        self._tee_initialized = True
+        
         if self.capabilities.sgx_available:
             self.sgx_enclave = SGXEnclave()
             if self.sgx_enclave.initialize():
-                self.active_tee = 'sgx'
+                self._active_tee = 'sgx'
                 return
         
         if self.capabilities.trustzone_available:
             self.trustzone_sw = TrustZoneSecureWorld()
             if self.trustzone_sw.initialize():
-                self.active_tee = 'trustzone'
+                self._active_tee = 'trustzone'
                 return
         
         # Fallback to software TEE
         self.software_tee = SoftwareTEE()
         if self.software_tee.initialize():
-            self.active_tee = 'software'
+            self._active_tee = 'software'
     
     def is_available(self) -> bool:
         """Check if TEE is available"""
@@ -452,11 +719,35 @@ class TEESupport:
         """Get the active TEE type"""
         return self.active_tee or 'none'
     
-    def secure_delete_tee(self, data: Any) -> bool:
-        """Securely delete data using TEE"""
+    def secure_delete_tee(self, data: Any, use_container: bool = False) -> bool:
+        """
+        Securely delete data using TEE.
+        
+        Mutable byte buffers are wiped in place. str and bytes are immutable,
+        so there is no buffer to wipe and copying them into the TEE would only
+        add another plaintext copy; False is returned since nothing was
+        overwritten. Text is the usual input, so this is logged at debug level. Other objects also return False so the
+        caller can overwrite them with its own strategy. Pass
+        use_container=True to force the copy-into-TEE-and-wipe path.
+        """
         if not self.is_available():
             return False
         
+        if not use_container:
+            if isinstance(data, bytearray):
+                _wipe(data, 0x00)
+                return True
+            if isinstance(data, memoryview) and not data.readonly and data.contiguous:
+                with data.cast('B') as view:
+                    view[:] = bytes(view.nbytes)
+                return True
+            if isinstance(data, (str, bytes)):
+                logger.debug(
+                    "In-place wipe impossible for immutable %s (%d items); "
+                    "no memory was overwritten", type(data).__name__, len(data)
+                )
+            return False
+        
         try:
             if self.active_tee == 'sgx':
                 return self._sgx_secure_delete(data)
@@ -475,10 +766,7 @@ class TEESupport:
             return False
         
         # Convert data to bytes
-        if isinstance(data, str):
-            data_bytes = data.encode('utf-8')
-        else:
-            data_bytes = str(data).encode('utf-8')
+        data_bytes = _to_bytes(data)
         
         # Allocate secure memory
         memory_id = self.sgx_enclave.secure_allocate(len(data_bytes))
@@ -498,10 +786,7 @@ class TEESupport:
             return False
         
         # Convert data to bytes
-        if isinstance(data, str):
-            data_bytes = data.encode('utf-8')
-        else:
-            data_bytes = str(data).encode('utf-8')
+        data_bytes = _to_bytes(data)
         
         # Create secure object
         object_id = self.trustzone_sw.secure_create_object('data', data_bytes)
@@ -517,10 +802,7 @@ class TEESupport:
             return False
         
         # Convert data to bytes
-        if isinstance(data, str):
-            data_bytes = data.encode('utf-8')
-        else:
-            data_bytes = str(data).encode('utf-8')
+        data_bytes = _to_bytes(data)
         
         # Create secure container
         container_id = self.software_tee.create_secure_container(data_bytes)
@@ -535,19 +817,27 @@ class TEESupport:
         if not self.is_available():
             return
         
+        # Non-paranoid backends wipe with a single zero pass, which a bulk
+        # sweep applies without per-item dispatch
         try:
             if self.active_tee == 'sgx' and self.sgx_enclave:
                 # Clear all secure memory
+                if not self.sgx_enclave.paranoid:
+                    _bulk_wipe(self.sgx_enclave.secure_memory)
                 for memory_id in list(self.sgx_enclave.secure_memory.keys()):
                     self.sgx_enclave.secure_delete(memory_id)
             
             elif self.active_tee == 'trustzone' and self.trustzone_sw:
                 # Clear all secure objects
+                if not self.trustzone_sw.paranoid:
+                    _bulk_wipe(self.trustzone_sw.secure_objects, 'data')
                 for object_id in list(self.trustzone_sw.secure_objects.keys()):
                     self.trustzone_sw.secure_operate(object_id, 'delete')
             
             elif self.active_tee == 'software' and self.software_tee:
                 # Clear all secure containers
+                if not self.software_tee.paranoid:
+                    _bulk_wipe(self.software_tee.secure_containers, 'data')
                 for container_id in list(self.software_tee.secure_containers.keys()):
                     self.software_tee.secure_operate(container_id, 'delete')
         except:
@@ -560,7 +850,7 @@ class TEESupport:
         
         attestation = {
             'tee_type': self.active_tee,
-            'capabilities': self.capabilities.capabilities,
+            'capabilities': self.capabilities.capabilities._asdict(),
             'timestamp': time.time()
         }
         
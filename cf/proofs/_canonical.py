@@ -0,0 +1,39 @@
+"""
+Canonical byte encoding for proof hashing and signing
+
+Hashing ``str(obj)`` runs Python's repr machinery over every field and ties
+the digest to repr formatting. Proof inputs are instead serialized to compact
+JSON with sorted keys, so equal values always hash to the same bytes.
+
+Signatures made on one host must verify on another, so the standard library
+encoder is the only encoder: optional fast encoders format floats, NumPy
+scalars and NaN differently, which would make digests depend on what happens
+to be installed. Floats and NumPy scalars are written as their float64 repr.
+"""
+
+import json
+from typing import Any
+
+import numpy as np
+
+
+def _default(obj: Any) -> Any:
+    """Encode values JSON has no native form for"""
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return bytes(obj).hex()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
+
+def canonical_bytes(obj: Any) -> bytes:
+    """Serialize obj to sorted-key compact JSON bytes"""
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'),
+                      default=_default).encode()
+
+
+def load_canonical(data: bytes) -> Any:
+    """Parse JSON bytes produced by canonical_bytes"""
+    return json.loads(data)
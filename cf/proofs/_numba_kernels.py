@@ -0,0 +1,71 @@
+"""
+Batch R1CS verification kernels
+
+A constraint system with many rank-1 constraints pays Python overhead per
+constraint when each one is verified on its own. The coefficient matrices
+are instead stored in CSR form as int64 arrays and checked in one call.
+When numba is installed the check runs as a compiled loop split across
+cores; otherwise the NumPy version is used.
+
+Callers must ensure every inner product fits in int64. Products of two
+inner products are compared by exact division, so they never overflow.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def _row_dot(indptr, indices, values, row, witness):
+        total = 0
+        for k in range(indptr[row], indptr[row + 1]):
+            total += values[k] * witness[indices[k]]
+        return total
+
+    @njit(parallel=True, cache=True)
+    def r1cs_verify_all(a_indptr, a_indices, a_values,
+                        b_indptr, b_indices, b_values,
+                        c_indptr, c_indices, c_values, witness):
+        """True when (A w) * (B w) == C w holds for every constraint row"""
+        rows = a_indptr.size - 1
+        failures = 0
+        for row in prange(rows):
+            aw = _row_dot(a_indptr, a_indices, a_values, row, witness)
+            bw = _row_dot(b_indptr, b_indices, b_values, row, witness)
+            cw = _row_dot(c_indptr, c_indices, c_values, row, witness)
+            # aw * bw == cw without forming the (possibly 128-bit) product
+            if bw == 0:
+                ok = cw == 0
+            else:
+                ok = cw % bw == 0 and cw // bw == aw
+            if not ok:
+                failures += 1
+        return failures == 0
+
+else:
+
+    def _csr_dot(indptr, indices, values, witness):
+        rows = np.repeat(np.arange(indptr.size - 1), np.diff(indptr))
+        totals = np.zeros(indptr.size - 1, dtype=np.int64)
+        np.add.at(totals, rows, values * witness[indices])
+        return totals
+
+    def r1cs_verify_all(a_indptr, a_indices, a_values,
+                        b_indptr, b_indices, b_values,
+                        c_indptr, c_indices, c_values, witness):
+        """True when (A w) * (B w) == C w holds for every constraint row"""
+        aw = _csr_dot(a_indptr, a_indices, a_values, witness)
+        bw = _csr_dot(b_indptr, b_indices, b_values, witness)
+        cw = _csr_dot(c_indptr, c_indices, c_values, witness)
+        # aw * bw == cw without forming the (possibly 128-bit) product
+        zero = bw == 0
+        safe_bw = np.where(zero, 1, bw)
+        divisible = (cw % safe_bw == 0) & (cw // safe_bw == aw)
+        return bool(np.all(np.where(zero, cw == 0, divisible)))
@@ -10,9 +10,9 @@ import time
 import secrets
 import numpy as np
 from typing import Any, Dict, List, Optional, Tuple
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
-from .zk_snark import EnhancedDeletionProofGenerator
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from ._canonical import canonical_bytes, load_canonical
+from .zk_snark import EnhancedDeletionProofGenerator, DeletionCertificateBatch
 
 
 class DeletionProofGenerator:
@@ -23,12 +23,17 @@ class DeletionProofGenerator:
     for improved security and efficiency.
     """
     
-    def __init__(self, security_parameter: int = 256):
+    # Ed25519 signing key shared by generators that are not given their own
+    _shared_signing_key: Optional[ed25519.Ed25519PrivateKey] = None
+    
+    def __init__(self, security_parameter: int = 256,
+                 signing_key: Optional[ed25519.Ed25519PrivateKey] = None):
         """
         Initialize the deletion proof generator.
         
         Args:
             security_parameter: Security parameter in bits
+            signing_key: Ed25519 key for proof signatures (default: process-wide key)
         """
         self.security_parameter = security_parameter
         self.proof_history = []
@@ -37,13 +42,12 @@ class DeletionProofGenerator:
         self.enhanced_prover = EnhancedDeletionProofGenerator(security_parameter)
         self.setup_complete = False
         
-        # Generate key pair for proof signing
-        # Ensure minimum key size of 1024 bits
-        key_size = max(security_parameter, 1024)
-        self.private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=key_size
-        )
+        # Key pair for proof signing, generated once per process unless injected
+        if signing_key is None:
+            if DeletionProofGenerator._shared_signing_key is None:
+                DeletionProofGenerator._shared_signing_key = ed25519.Ed25519PrivateKey.generate()
+            signing_key = DeletionProofGenerator._shared_signing_key
+        self.private_key = signing_key
         self.public_key = self.private_key.public_key()
         
     def setup(self) -> Tuple[bytes, bytes]:
@@ -96,11 +100,8 @@ class DeletionProofGenerator:
         statement = {
             'public_inputs': {
                 'resonance_commitment': self._commit_resonance(resonance),
-                'deletion_certificate_hashes': [
-                    hashlib.sha256(str(cert).encode()).hexdigest() 
-                    for cert in deletion_certificates
-                ],
-                'output_hash': hashlib.sha256(str(output).encode()).hexdigest(),
+                'deletion_certificate_hashes': self._hash_certificates(deletion_certificates),
+                'output_hash': hashlib.sha256(canonical_bytes(output)).hexdigest(),
                 'timestamp': time.time()
             },
             'constraints': [
@@ -113,6 +114,13 @@ class DeletionProofGenerator:
         
         return statement
     
+    def _hash_certificates(self, certificates: List[Dict[str, Any]]) -> List[str]:
+        """SHA-256 hex digest of each certificate's canonical encoding"""
+        # Serialize every certificate first, then run the digests back to back
+        # with the constructor bound locally
+        sha256 = hashlib.sha256
+        return [sha256(payload).hexdigest() for payload in map(canonical_bytes, certificates)]
+    
     def _create_proof_witness(self, resonance: np.ndarray, 
                               deletion_certificates: List[Dict[str, Any]], 
                               output: Any) -> Dict[str, Any]:
@@ -141,8 +149,8 @@ class DeletionProofGenerator:
         
         # Create proof components
         proof_components = {
-            'statement_hash': hashlib.sha256(str(statement).encode()).hexdigest(),
-            'witness_hash': hashlib.sha256(str(witness).encode()).hexdigest(),
+            'statement_hash': hashlib.sha256(canonical_bytes(statement)).hexdigest(),
+            'witness_hash': hashlib.sha256(canonical_bytes(witness)).hexdigest(),
             'constraint_verification': self._verify_constraints(statement, witness),
             'timestamp': time.time(),
             'nonce': secrets.token_hex(16)
@@ -152,9 +160,8 @@ class DeletionProofGenerator:
         proof_signature = self._sign_proof(proof_components)
         proof_components['signature'] = proof_signature
         
-        # Convert to JSON bytes for safe parsing
-        import json
-        proof_bytes = json.dumps(proof_components).encode()
+        # Canonical JSON bytes are parsed back without executing anything
+        proof_bytes = canonical_bytes(proof_components)
         
         return proof_bytes
     
@@ -168,32 +175,25 @@ class DeletionProofGenerator:
         """Extract randomness used in synthesis"""
         # Extract entropy from output
         if isinstance(output, str):
-            # Use character distribution as entropy source
-            char_counts = {}
-            for char in output:
-                char_counts[char] = char_counts.get(char, 0) + 1
+            # Use the UTF-8 byte distribution as entropy source
+            byte_values = np.frombuffer(output.encode('utf-8'), dtype=np.uint8)
+            byte_counts = np.bincount(byte_values, minlength=256).astype(np.uint32)
             
             # Create entropy hash
-            entropy_string = ''.join([f"{char}{count}" for char, count in char_counts.items()])
-            return hashlib.sha256(entropy_string.encode()).hexdigest()
+            return hashlib.sha256(byte_counts.tobytes()).hexdigest()
         else:
             # Generic entropy extraction
-            return hashlib.sha256(str(output).encode()).hexdigest()
+            return hashlib.sha256(canonical_bytes(output)).hexdigest()
     
     def _verify_deletion_certificates(self, certificates: List[Dict[str, Any]]) -> bool:
         """Verify deletion certificates"""
         if not certificates:
             return False
         
-        for cert in certificates:
-            if not cert.get('deletion_successful', False):
-                return False
-            
-            # Check timestamp validity
-            if time.time() - cert['timestamp'] > 3600:  # 1 hour
-                return False
+        batch = DeletionCertificateBatch.from_certificates(certificates)
         
-        return True
+        # Every deletion must have succeeded within the last hour
+        return batch.all_successful() and batch.all_recent(time.time())
     
     def _verify_constraints(self, statement: Dict[str, Any], 
                            witness: Dict[str, Any]) -> Dict[str, bool]:
@@ -271,17 +271,10 @@ class DeletionProofGenerator:
         """Sign the proof components"""
         try:
             # Create message to sign
-            message = str(proof_components).encode()
+            message = canonical_bytes(proof_components)
             
             # Sign with private key
-            signature = self.private_key.sign(
-                message,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
+            signature = self.private_key.sign(message)
             
             return signature.hex()
         except:
@@ -313,8 +306,7 @@ class DeletionProofGenerator:
     def _verify_enhanced_proof(self, proof: bytes, public_inputs: Dict[str, Any]) -> bool:
         """Verify enhanced zk-SNARK proof"""
         try:
-            import json
-            proof_data = json.loads(proof.decode())
+            proof_data = load_canonical(proof)
             
             # Check proof structure
             required_fields = ['A', 'B', 'C', 'public_inputs', 'signature']
@@ -346,24 +338,16 @@ class DeletionProofGenerator:
         try:
             # Extract signature
             signature_hex = proof_components.get('signature', '')
-            if not signature_hex or signature_components == 'signature_failed':
+            if not signature_hex or signature_hex == 'signature_failed':
                 return False
             
             # Recreate message (excluding signature)
             message_components = {k: v for k, v in proof_components.items() if k != 'signature'}
-            message = str(message_components).encode()
+            message = canonical_bytes(message_components)
             
             # Verify signature
             signature = bytes.fromhex(signature_hex)
-            self.public_key.verify(
-                signature,
-                message,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
+            self.public_key.verify(signature, message)
             
             return True
             
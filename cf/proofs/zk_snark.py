@@ -5,16 +5,93 @@ This module provides a more robust zk-SNARK implementation for the CF protocol,
 including support for Groth16-style proofs and proper constraint systems.
 """
 
+import copy
+import functools
 import hashlib
 import time
 import secrets
 import numpy as np
-from typing import Any, Dict, List, Tuple, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple, Optional, Union
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-import json
+
+from ._canonical import canonical_bytes, load_canonical
+from . import _numba_kernels as kernels
+
+
+# Field modulus for R1CS constraint checks
+R1CS_MODULUS = 1 << 256
+
+# Proving-key entries holding trusted setup scalars
+SETUP_SCALARS = ('alpha', 'beta', 'gamma', 'delta')
+
+# Largest magnitude an int64 dot product may reach before it can wrap
+INT64_SAFE_BOUND = 1 << 63
+
+
+def _coefficient_vector(values: List[int]) -> np.ndarray:
+    """Integer vector as int64, or as Python ints when values exceed int64"""
+    try:
+        return np.asarray(values, dtype=np.int64)
+    except OverflowError:
+        return np.asarray(values, dtype=object)
+
+
+# Oldest certificate age, in seconds, a deletion proof accepts
+CERTIFICATE_MAX_AGE = 3600
+
+
+@dataclass
+class DeletionCertificateBatch:
+    """Success flags and timestamps of a certificate list, as parallel arrays"""
+    success: np.ndarray
+    timestamps: np.ndarray
+    
+    @classmethod
+    def from_certificates(cls, certificates: Any) -> 'DeletionCertificateBatch':
+        """Build from certificate dicts, or reuse the columns of a CertificateLog"""
+        if hasattr(certificates, 'successful') and hasattr(certificates, 'timestamps'):
+            return cls(np.frombuffer(certificates.successful, dtype=np.uint8).astype(bool),
+                       np.frombuffer(certificates.timestamps, dtype=np.float64))
+        
+        success = np.fromiter((bool(cert.get('deletion_successful', False)) for cert in certificates),
+                              dtype=bool, count=len(certificates))
+        timestamps = np.fromiter((cert.get('timestamp', 0.0) for cert in certificates),
+                                 dtype=np.float64, count=len(certificates))
+        return cls(success, timestamps)
+    
+    def all_successful(self) -> bool:
+        """True when every certificate reports a successful deletion"""
+        return bool(self.success.all())
+    
+    def all_recent(self, now: float, max_age: float = CERTIFICATE_MAX_AGE) -> bool:
+        """True when no certificate is older than max_age seconds at now"""
+        return len(self.timestamps) == 0 or bool(now - self.timestamps.min() <= max_age)
+
+
+def _weighted_witness_sum(witness: Union[List[int], np.ndarray], offset: int) -> int:
+    """sum(witness[i] * (i + offset)), exact for arbitrarily large values"""
+    w = _coefficient_vector(witness)
+    if not len(w):
+        return 0
+    weights = np.arange(offset, offset + len(w), dtype=np.int64)
+    if w.dtype != object and int(np.abs(w).max()) * (offset + len(w)) * len(w) >= INT64_SAFE_BOUND:
+        w = w.astype(object)
+    if w.dtype == object:
+        weights = weights.astype(object)
+    return int(w.dot(weights))
+
+
+def _point_bytes(point: Any) -> bytes:
+    """Raw point digest from bytes or its hex serialization"""
+    if isinstance(point, (bytes, bytearray)):
+        return bytes(point)
+    if isinstance(point, str):
+        return bytes.fromhex(point)
+    return b''
 
 
 class ConstraintSystem:
@@ -42,49 +119,137 @@ class ConstraintSystem:
     def get_constraint_count(self) -> int:
         """Get the number of constraints"""
         return len(self.constraints)
+    
+    def digest(self) -> str:
+        """Structural hash of the variables and constraints"""
+        return hashlib.sha256(canonical_bytes({
+            'variables': self.variables,
+            'constraints': self.constraints
+        })).hexdigest()
 
 
 class R1CSConstraint:
     """Rank-1 Constraint System constraint"""
     
     def __init__(self, a: List[int], b: List[int], c: List[int]):
-        self.a = a  # Left side coefficients
-        self.b = b  # Right side coefficients  
-        self.c = c  # Output coefficients
+        self.a = _coefficient_vector(a)  # Left side coefficients
+        self.b = _coefficient_vector(b)  # Right side coefficients  
+        self.c = _coefficient_vector(c)  # Output coefficients
+        self.width = max(len(self.a), len(self.b), len(self.c))
+        self._max_coefficient = max(
+            (int(np.abs(v).max()) for v in (self.a, self.b, self.c) if len(v)),
+            default=0
+        )
     
     def verify(self, witness: List[int]) -> bool:
         """Verify constraint with witness values"""
-        if len(witness) < max(len(self.a), len(self.b), len(self.c)):
+        if len(witness) < self.width:
             return False
         
-        # Compute a * witness
-        a_witness = sum(a_i * witness[i] if i < len(witness) else 0 
-                       for i, a_i in enumerate(self.a))
+        w = _coefficient_vector(witness[:self.width])
         
-        # Compute b * witness
-        b_witness = sum(b_i * witness[i] if i < len(witness) else 0 
-                       for i, b_i in enumerate(self.b))
+        # int64 dot products are exact only while every partial sum fits;
+        # otherwise fall back to Python integers inside NumPy
+        if w.dtype != object and len(w):
+            bound = self._max_coefficient * int(np.abs(w).max()) * self.width
+            if bound >= INT64_SAFE_BOUND:
+                w = w.astype(object)
         
-        # Compute c * witness
-        c_witness = sum(c_i * witness[i] if i < len(witness) else 0 
-                       for i, c_i in enumerate(self.c))
+        # Compute a * witness, b * witness and c * witness
+        a_witness = int(self.a.dot(w[:len(self.a)]))
+        b_witness = int(self.b.dot(w[:len(self.b)]))
+        c_witness = int(self.c.dot(w[:len(self.c)]))
         
         # Check: (a * witness) * (b * witness) = c * witness
-        return (a_witness * b_witness) % (2**256) == c_witness % (2**256)
+        return (a_witness * b_witness - c_witness) % R1CS_MODULUS == 0
+
+
+class R1CSConstraintSet:
+    """
+    Many R1CS constraints verified together.
+    
+    The A, B and C coefficient rows are packed into CSR int64 arrays so the
+    whole system is checked by one kernel call instead of a Python loop.
+    Systems or witnesses too large for exact int64 arithmetic fall back to
+    per-constraint verification.
+    """
+    
+    def __init__(self, constraints: List[R1CSConstraint]):
+        self.constraints = list(constraints)
+        self.width = max((c.width for c in self.constraints), default=0)
+        self._max_coefficient = max((c._max_coefficient for c in self.constraints), default=0)
+        self._packed = all(
+            v.dtype != object for c in self.constraints for v in (c.a, c.b, c.c)
+        )
+        if self._packed:
+            self._a = self._to_csr([c.a for c in self.constraints])
+            self._b = self._to_csr([c.b for c in self.constraints])
+            self._c = self._to_csr([c.c for c in self.constraints])
+    
+    @staticmethod
+    def _to_csr(rows: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(indptr, indices, values) of the nonzero coefficients in rows"""
+        indices = [np.flatnonzero(row) for row in rows]
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(i) for i in indices])
+        if indices:
+            values = np.concatenate([row[i] for row, i in zip(rows, indices)]).astype(np.int64)
+            indices = np.concatenate(indices).astype(np.int64)
+        else:
+            values = indices = np.zeros(0, dtype=np.int64)
+        return indptr, indices, values
+    
+    def verify(self, witness: List[int]) -> bool:
+        """Verify every constraint with the same witness values"""
+        if len(witness) < self.width:
+            return False
+        if not self.constraints:
+            return True
+        
+        w = _coefficient_vector(witness[:self.width])
+        if self._packed and w.dtype != object:
+            bound = self._max_coefficient * (int(np.abs(w).max()) if len(w) else 0) * self.width
+            if bound < INT64_SAFE_BOUND:
+                return bool(kernels.r1cs_verify_all(*self._a, *self._b, *self._c, w))
+        
+        return all(constraint.verify(witness) for constraint in self.constraints)
 
 
 class Groth16Prover:
     """Groth16 zk-SNARK prover implementation"""
     
-    def __init__(self, security_parameter: int = 256):
+    # Setup results keyed by (security parameter, constraint system digest),
+    # shared process-wide; kept in memory only since they include the
+    # trusted setup scalars
+    _setup_cache: Dict[Tuple[int, str], Tuple[Dict, Dict, bytes, bytes]] = {}
+    
+    def __init__(self, security_parameter: int = 256, share_setup: bool = True):
         self.security_parameter = security_parameter
+        self.share_setup = share_setup
         self.constraint_system = ConstraintSystem()
         self.setup_complete = False
         self.proving_key = None
         self.verification_key = None
+        self.verification_key_bytes = None
         
     def setup(self, constraint_system: ConstraintSystem) -> Tuple[bytes, bytes]:
-        """Generate proving and verification keys"""
+        """
+        Generate proving and verification keys.
+        
+        By default every prover in the process shares one trusted setup per
+        (security parameter, circuit): the first setup's scalars and keys are
+        reused by later provers with an identical constraint system. Create
+        the prover with share_setup=False to draw fresh setup scalars that
+        are neither reused nor shared.
+        """
+        
+        # Reuse the keys of an identical circuit set up earlier in this process
+        cache_key = (self.security_parameter, constraint_system.digest())
+        cached = Groth16Prover._setup_cache.get(cache_key) if self.share_setup else None
+        if cached is not None:
+            self.proving_key, self.verification_key, proving_key_bytes, self.verification_key_bytes = cached
+            self.setup_complete = True
+            return proving_key_bytes, self.verification_key_bytes
         
         # Generate trusted setup parameters
         alpha = secrets.randbits(self.security_parameter)
@@ -115,13 +280,28 @@ class Groth16Prover:
         self.verification_key = verification_key
         self.setup_complete = True
         
-        # Serialize keys
-        proving_key_bytes = json.dumps(proving_key).encode()
-        verification_key_bytes = json.dumps(verification_key).encode()
+        # Serialize keys, with setup scalars as fixed-width big-endian bytes
+        # so the encoder never renders 256-bit integers in decimal
+        scalar_width = (self.security_parameter + 7) // 8
+        proving_key_bytes = canonical_bytes({
+            name: value.to_bytes(scalar_width, 'big') if name in SETUP_SCALARS else value
+            for name, value in proving_key.items()
+        })
+        verification_key_bytes = canonical_bytes(verification_key)
+        
+        # The verification key is immutable after setup; verify() reuses the
+        # parsed form when handed these exact bytes
+        self.verification_key_bytes = verification_key_bytes
+        
+        if self.share_setup:
+            Groth16Prover._setup_cache[cache_key] = (
+                proving_key, verification_key, proving_key_bytes, verification_key_bytes
+            )
         
         return proving_key_bytes, verification_key_bytes
     
-    def prove(self, witness: List[int], public_inputs: List[int]) -> bytes:
+    def prove(self, witness: Union[List[int], np.ndarray], public_inputs: List[int],
+              timestamp: Optional[float] = None) -> bytes:
         """Generate a zk-SNARK proof"""
         if not self.setup_complete:
             raise ValueError("Setup must be completed before proving")
@@ -136,21 +316,24 @@ class Groth16Prover:
             'B': self._compute_b_component(witness, s),
             'C': self._compute_c_component(witness, r, s),
             'public_inputs': public_inputs,
-            'timestamp': time.time()
+            'timestamp': time.time() if timestamp is None else timestamp
         }
         
         # Sign the proof
         proof_signature = self._sign_proof(proof)
         proof['signature'] = proof_signature
         
-        return json.dumps(proof).encode()
+        return canonical_bytes(proof)
     
     def verify(self, proof: bytes, verification_key: bytes) -> bool:
         """Verify a zk-SNARK proof"""
         try:
             # Parse proof and verification key
-            proof_data = json.loads(proof.decode())
-            vk_data = json.loads(verification_key.decode())
+            proof_data = load_canonical(proof)
+            if verification_key == self.verification_key_bytes:
+                vk_data = self.verification_key
+            else:
+                vk_data = load_canonical(verification_key)
             
             # Verify signature
             if not self._verify_proof_signature(proof_data):
@@ -164,38 +347,43 @@ class Groth16Prover:
         except Exception as e:
             return False
     
-    def _point_multiply(self, scalar: int, group: str) -> str:
+    def _point_multiply(self, scalar: int, group: str) -> bytes:
         """Simulate elliptic curve point multiplication"""
         # In practice, this would use actual elliptic curve operations
-        # For now, we simulate with hash-based commitments
-        data = f"{scalar}_{group}_{secrets.randbits(256)}"
-        return hashlib.sha256(data.encode()).hexdigest()
+        # For now, we simulate with hash-based commitments over raw bytes
+        data = (scalar % R1CS_MODULUS).to_bytes(32, 'big') + group.encode() + secrets.token_bytes(32)
+        return hashlib.sha256(data).digest()
     
-    def _generate_gamma_abc(self, constraint_system: ConstraintSystem, gamma: int) -> List[str]:
+    def _generate_gamma_abc(self, constraint_system: ConstraintSystem, gamma: int) -> List[bytes]:
         """Generate gamma_abc values for verification key"""
-        gamma_abc = []
-        for i in range(len(constraint_system.variables)):
-            gamma_abc.append(self._point_multiply(gamma * i, 'g1'))
-        return gamma_abc
+        # Same encoding as _point_multiply, with the randomness drawn in one call
+        count = len(constraint_system.variables)
+        randomness = secrets.token_bytes(32 * count)
+        sha256 = hashlib.sha256
+        return [
+            sha256((gamma * i % R1CS_MODULUS).to_bytes(32, 'big') + b'g1'
+                   + randomness[32 * i:32 * (i + 1)]).digest()
+            for i in range(count)
+        ]
     
-    def _compute_a_component(self, witness: List[int], r: int) -> str:
+    def _compute_a_component(self, witness: Union[List[int], np.ndarray], r: int) -> bytes:
         """Compute A component of the proof"""
         # Simplified A computation
-        a_sum = sum(witness[i] * (i + 1) for i in range(len(witness)))
+        a_sum = _weighted_witness_sum(witness, 1)
         a_value = (a_sum + r) % (2**256)
         return self._point_multiply(a_value, 'g1')
     
-    def _compute_b_component(self, witness: List[int], s: int) -> str:
+    def _compute_b_component(self, witness: Union[List[int], np.ndarray], s: int) -> bytes:
         """Compute B component of the proof"""
         # Simplified B computation
-        b_sum = sum(witness[i] * (i + 2) for i in range(len(witness)))
+        b_sum = _weighted_witness_sum(witness, 2)
         b_value = (b_sum + s) % (2**256)
         return self._point_multiply(b_value, 'g2')
     
-    def _compute_c_component(self, witness: List[int], r: int, s: int) -> str:
+    def _compute_c_component(self, witness: Union[List[int], np.ndarray], r: int, s: int) -> bytes:
         """Compute C component of the proof"""
         # Simplified C computation
-        c_sum = sum(witness[i] * (i + 3) for i in range(len(witness)))
+        c_sum = _weighted_witness_sum(witness, 3)
         c_value = (c_sum + r + s) % (2**256)
         return self._point_multiply(c_value, 'g1')
     
@@ -205,27 +393,26 @@ class Groth16Prover:
         # In practice, this would use actual bilinear pairing operations
         
         # Extract proof components
-        A = proof.get('A', '')
-        B = proof.get('B', '')
-        C = proof.get('C', '')
+        A = _point_bytes(proof.get('A'))
+        B = _point_bytes(proof.get('B'))
+        C = _point_bytes(proof.get('C'))
         
         # Extract verification key components
-        alpha_g1 = vk.get('alpha_g1', '')
-        beta_g2 = vk.get('beta_g2', '')
-        gamma_g2 = vk.get('gamma_g2', '')
+        alpha_g1 = _point_bytes(vk.get('alpha_g1'))
+        beta_g2 = _point_bytes(vk.get('beta_g2'))
+        gamma_g2 = _point_bytes(vk.get('gamma_g2'))
         
         # Simulate pairing check
         # In practice, this would be: e(A, B) == e(α, β) * e(C, γ)
-        left_side = hashlib.sha256(f"{A}_{B}".encode()).hexdigest()
-        right_side = hashlib.sha256(f"{alpha_g1}_{beta_g2}_{C}_{gamma_g2}".encode()).hexdigest()
+        left_side = hashlib.sha256(A + B).digest()
+        right_side = hashlib.sha256(alpha_g1 + beta_g2 + C + gamma_g2).digest()
         
         return left_side == right_side
     
     def _sign_proof(self, proof: Dict) -> str:
         """Sign the proof for integrity"""
         # Generate a simple signature for proof integrity
-        proof_string = json.dumps(proof, sort_keys=True)
-        return hashlib.sha256(proof_string.encode()).hexdigest()
+        return hashlib.sha256(canonical_bytes(proof)).hexdigest()
     
     def _verify_proof_signature(self, proof: Dict) -> bool:
         """Verify proof signature"""
@@ -240,55 +427,60 @@ class Groth16Prover:
         return signature == expected_signature
 
 
+@functools.lru_cache(maxsize=None)
+def _deletion_constraint_system() -> ConstraintSystem:
+    """Constraint system for deletion proofs, built once; callers must copy it"""
+    constraint_system = ConstraintSystem()
+    
+    # Add variables
+    resonance_var = constraint_system.add_variable('resonance')
+    deletion_var = constraint_system.add_variable('deletion')
+    output_var = constraint_system.add_variable('output')
+    timestamp_var = constraint_system.add_variable('timestamp')
+    
+    # Add constraints
+    # Constraint 1: Resonance commitment must be valid
+    constraint_system.add_constraint({
+        'type': 'resonance_commitment',
+        'variables': [resonance_var],
+        'constraint': 'resonance_valid'
+    })
+    
+    # Constraint 2: Deletion must be successful
+    constraint_system.add_constraint({
+        'type': 'deletion_success',
+        'variables': [deletion_var],
+        'constraint': 'deletion_successful'
+    })
+    
+    # Constraint 3: Output synthesis must be correct
+    constraint_system.add_constraint({
+        'type': 'output_synthesis',
+        'variables': [resonance_var, output_var],
+        'constraint': 'synthesis_correct'
+    })
+    
+    # Constraint 4: Source must be unrecoverable
+    constraint_system.add_constraint({
+        'type': 'source_unrecoverable',
+        'variables': [resonance_var, deletion_var],
+        'constraint': 'source_destroyed'
+    })
+    
+    return constraint_system
+
+
 class EnhancedDeletionProofGenerator:
     """Enhanced deletion proof generator with zk-SNARK support"""
     
-    def __init__(self, security_parameter: int = 256):
+    def __init__(self, security_parameter: int = 256, share_setup: bool = True):
         self.security_parameter = security_parameter
-        self.groth16_prover = Groth16Prover(security_parameter)
-        self.constraint_system = ConstraintSystem()
+        self.groth16_prover = Groth16Prover(security_parameter, share_setup=share_setup)
         self.setup_complete = False
         
-        # Setup constraint system
-        self._setup_constraints()
-    
-    def _setup_constraints(self):
-        """Setup the constraint system for deletion proofs"""
-        
-        # Add variables
-        resonance_var = self.constraint_system.add_variable('resonance')
-        deletion_var = self.constraint_system.add_variable('deletion')
-        output_var = self.constraint_system.add_variable('output')
-        timestamp_var = self.constraint_system.add_variable('timestamp')
-        
-        # Add constraints
-        # Constraint 1: Resonance commitment must be valid
-        self.constraint_system.add_constraint({
-            'type': 'resonance_commitment',
-            'variables': [resonance_var],
-            'constraint': 'resonance_valid'
-        })
-        
-        # Constraint 2: Deletion must be successful
-        self.constraint_system.add_constraint({
-            'type': 'deletion_success',
-            'variables': [deletion_var],
-            'constraint': 'deletion_successful'
-        })
-        
-        # Constraint 3: Output synthesis must be correct
-        self.constraint_system.add_constraint({
-            'type': 'output_synthesis',
-            'variables': [resonance_var, output_var],
-            'constraint': 'synthesis_correct'
-        })
-        
-        # Constraint 4: Source must be unrecoverable
-        self.constraint_system.add_constraint({
-            'type': 'source_unrecoverable',
-            'variables': [resonance_var, deletion_var],
-            'constraint': 'source_destroyed'
-        })
+        # The deletion circuit is built once; each generator gets its own copy
+        # so adding constraints to one never changes the others
+        self.constraint_system = copy.deepcopy(_deletion_constraint_system())
     
     def setup(self) -> Tuple[bytes, bytes]:
         """Setup the proof system"""
@@ -307,12 +499,15 @@ class EnhancedDeletionProofGenerator:
         if not self.setup_complete:
             raise ValueError("Setup must be completed before generating proofs")
         
+        # One clock sample stamps both the witness and the proof
+        now = time.time()
+        
         # Convert inputs to witness format
-        witness = self._create_witness(resonance, deletion_certificates, output)
+        witness = self._create_witness(resonance, deletion_certificates, output, now)
         public_inputs = self._create_public_inputs(resonance, output)
         
         # Generate proof
-        proof = self.groth16_prover.prove(witness, public_inputs)
+        proof = self.groth16_prover.prove(witness, public_inputs, timestamp=now)
         
         return proof
     
@@ -322,25 +517,23 @@ class EnhancedDeletionProofGenerator:
     
     def _create_witness(self, resonance: np.ndarray, 
                        deletion_certificates: List[Dict[str, Any]], 
-                       output: Any) -> List[int]:
+                       output: Any, timestamp: Optional[float] = None) -> np.ndarray:
         """Create witness for the proof"""
-        witness = []
-        
-        # Add resonance values (normalized to integers)
-        resonance_int = (resonance * 1000).astype(int).tolist()
-        witness.extend(resonance_int)
-        
         # Add deletion certificate values
-        deletion_success = 1 if all(cert.get('deletion_successful', False) 
-                                  for cert in deletion_certificates) else 0
-        witness.append(deletion_success)
+        batch = DeletionCertificateBatch.from_certificates(deletion_certificates)
+        deletion_success = 1 if batch.all_successful() else 0
         
         # Add output hash
-        output_hash = int(hashlib.sha256(str(output).encode()).hexdigest()[:8], 16)
-        witness.append(output_hash)
+        output_hash = int.from_bytes(hashlib.sha256(canonical_bytes(output)).digest()[:4], 'big')
         
         # Add timestamp
-        witness.append(int(time.time()))
+        witness_time = int(time.time() if timestamp is None else timestamp)
+        
+        # Resonance values (normalized to integers) are cast straight into the
+        # int64 witness buffer, followed by the scalar entries
+        witness = np.empty(resonance.size + 3, dtype=np.int64)
+        np.multiply(resonance.reshape(-1), 1000, out=witness[:resonance.size], casting='unsafe')
+        witness[resonance.size:] = (deletion_success, output_hash, witness_time)
         
         return witness
     
@@ -353,7 +546,7 @@ class EnhancedDeletionProofGenerator:
         public_inputs.append(resonance_commitment)
         
         # Add output hash
-        output_hash = int(hashlib.sha256(str(output).encode()).hexdigest()[:8], 16)
+        output_hash = int(hashlib.sha256(canonical_bytes(output)).hexdigest()[:8], 16)
         public_inputs.append(output_hash)
         
         return public_inputs
\ No newline at end of file
@@ -8,6 +8,7 @@ This module provides:
 """
 
 import time
+import threading
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from enum import Enum
@@ -66,6 +67,7 @@ class PerformanceMetrics:
     total_time: float = 0.0
     total_memory: int = 0
     start_time: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
     
     def phase_start(self, phase_name: str):
         """Start timing a phase"""
@@ -80,6 +82,13 @@ class PerformanceMetrics:
             self.total_memory += memory_usage
             self.start_time = None
     
+    def record_phase(self, phase_name: str, duration: float, memory_usage: int = 0):
+        """Record a phase timed by the caller (safe to call from worker threads)"""
+        with self._lock:
+            self.phase_times[phase_name] = duration
+            self.phase_memory[phase_name] = memory_usage
+            self.total_memory += memory_usage
+    
     def set_total_time(self, total_time: float):
         """Set the total execution time"""
         self.total_time = total_time
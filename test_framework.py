@@ -80,6 +80,79 @@ def test_individual_components():
         print(f"   ❌ Proof generator failed: {e}")
 
 
+def test_extractor_source_types():
+    """Test extraction from sources the task-specific losses accept as-is"""
+    
+    print("\n\n🧩 Testing Extractor Source Types")
+    print("=" * 50)
+    
+    sources = {
+        'list of str': ['alpha', 'beta', 'alpha'],
+        'list of dict': [{'a': 1}, {'b': 2}],
+        'nested list': [[1, 2], [3, 4]],
+        '2D array': np.arange(6.0).reshape(2, 3)
+    }
+    tasks = [
+        {'task_type': 'text_generation'},
+        {'task_type': 'classification', 'target_class': 'positive'}
+    ]
+    
+    for requirements in tasks:
+        for name, source in sources.items():
+            extractor = InformationBottleneckExtractor(target_dims=8, mutual_info_penalty=1.0)
+            extractor.mine_estimator.epochs = 2
+            resonance = extractor.extract(source, requirements)
+            assert resonance.shape == (8,), (name, requirements)
+            assert resonance.dtype == np.float64, (name, requirements)
+            print(f"   ✅ {requirements['task_type']}: {name}")
+
+
+def test_extractor_gradients():
+    """Test analytic functional-loss gradients against finite differences"""
+    
+    print("\n\n📐 Testing Extractor Gradients")
+    print("=" * 50)
+    
+    from cf.extractors.information_bottleneck import RESONANCE_DTYPE
+    
+    text = "The quick brown fox jumps over the lazy dog and the fox runs."
+    array = np.arange(12.0)
+    cases = {
+        'text_generation': (text, {'task_type': 'text_generation'}),
+        'classification': (text, {'task_type': 'classification', 'target_class': 'positive'}),
+        'translation': (text, {'task_type': 'translation', 'source_language': 'en',
+                               'target_language': 'fr'}),
+        'generic': (array, {'task_type': 'generic'}),
+        'generic + l1': (array, {'task_type': 'generic', 'regularization': 'l1'}),
+        'generic + l2': (array, {'task_type': 'generic', 'regularization': 'l2'})
+    }
+    
+    # Resonance is float32, so the step is large; keep components away from
+    # zero so the L1 kink stays outside every difference stencil
+    h = 3e-2
+    rng = np.random.default_rng(0)
+    
+    for name, (source, requirements) in cases.items():
+        extractor = InformationBottleneckExtractor(target_dims=16, mutual_info_penalty=0.0)
+        source_features = extractor._extract_source_features(source, requirements)
+        loss_fn = extractor._resolve_functional_loss(source_features, requirements)
+        
+        point = rng.normal(0, 1, 16)
+        resonance = (np.sign(point) * (0.5 + np.abs(point))).astype(RESONANCE_DTYPE)
+        _, grad = loss_fn(resonance)
+        
+        numeric = np.empty(16)
+        for i, step in enumerate(h * np.eye(16)):
+            upper = loss_fn((resonance + step).astype(RESONANCE_DTYPE))[0]
+            lower = loss_fn((resonance - step).astype(RESONANCE_DTYPE))[0]
+            numeric[i] = (upper - lower) / (2 * h)
+        
+        assert np.linalg.norm(grad) > 0, name
+        error = np.linalg.norm(grad - numeric) / np.linalg.norm(grad)
+        assert error < 5e-3, (name, error)
+        print(f"   ✅ {name}: relative error {error:.2e}")
+
+
 def test_tecs_framework():
     """Test the TECS framework"""
     
@@ -171,6 +244,12 @@ def main():
         # Test individual components
         test_individual_components()
         
+        # Test extractor source handling
+        test_extractor_source_types()
+        
+        # Test extractor loss gradients
+        test_extractor_gradients()
+        
         # Test TECS framework
         test_tecs_framework()
         